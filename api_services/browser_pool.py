@@ -0,0 +1,132 @@
+import atexit
+import threading
+import time
+import logging
+from typing import Any, Callable, Dict
+
+logger = logging.getLogger(__name__)
+
+class BrowserPool:
+    def __init__(self, driver_factory: Callable[[], Any], max_size: int = 2, max_uses: int = 25,
+                 max_memory_mb: int = 512, checkout_timeout: float = 120):
+        self.driver_factory = driver_factory
+        self.max_size = max(1, max_size)
+        self.max_uses = max_uses
+        self.max_memory_mb = max_memory_mb
+        self.checkout_timeout = checkout_timeout
+        self.stats = {'created': 0, 'reused': 0, 'recycled': 0, 'health_failures': 0}
+
+        self._idle = []
+        self._uses = {}
+        self._size = 0
+        self._closed = False
+        self._condition = threading.Condition()
+        atexit.register(self.shutdown)
+
+    def checkout(self) -> Any:
+        deadline = time.time() + self.checkout_timeout
+        while True:
+            driver = None
+            with self._condition:
+                while not self._idle and self._size >= self.max_size:
+                    if self._closed:
+                        raise RuntimeError("Browser-Pool ist geschlossen")
+                    remaining = deadline - time.time()
+                    if remaining <= 0:
+                        raise TimeoutError("Kein Browser im Pool verfügbar")
+                    self._condition.wait(remaining)
+                if self._closed:
+                    raise RuntimeError("Browser-Pool ist geschlossen")
+                if self._idle:
+                    driver = self._idle.pop()
+                else:
+                    self._size += 1
+
+            if driver is None:
+                return self._create_driver()
+
+            if self._is_healthy(driver):
+                self.stats['reused'] += 1
+                return driver
+
+            self.stats['health_failures'] += 1
+            logger.warning("Browser im Pool reagiert nicht mehr, wird ersetzt")
+            self._discard(driver)
+
+    def release(self, driver: Any):
+        uses = self._uses.get(id(driver), 0) + 1
+        self._uses[id(driver)] = uses
+
+        if self._closed or uses >= self.max_uses or not self._is_healthy(driver) or self._memory_exceeded(driver):
+            self.stats['recycled'] += 1
+            logger.info(f"Browser wird nach {uses} Verwendungen recycelt")
+            self._discard(driver)
+            return
+
+        try:
+            driver.get('about:blank')
+        except Exception:
+            self._discard(driver)
+            return
+
+        with self._condition:
+            self._idle.append(driver)
+            self._condition.notify()
+
+    def _create_driver(self) -> Any:
+        try:
+            driver = self.driver_factory()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._condition.notify()
+            raise
+        self._uses[id(driver)] = 0
+        self.stats['created'] += 1
+        return driver
+
+    def _discard(self, driver: Any):
+        self._uses.pop(id(driver), None)
+        try:
+            driver.quit()
+        except Exception as e:
+            logger.warning(f"Fehler beim Beenden eines Browsers: {e}")
+        with self._condition:
+            self._size -= 1
+            self._condition.notify()
+
+    def _is_healthy(self, driver: Any) -> bool:
+        try:
+            return driver.execute_script("return 1") == 1
+        except Exception:
+            return False
+
+    def _memory_exceeded(self, driver: Any) -> bool:
+        if not self.max_memory_mb:
+            return False
+        try:
+            used_bytes = driver.execute_script(
+                "return (window.performance && performance.memory) ? performance.memory.usedJSHeapSize : 0"
+            ) or 0
+        except Exception:
+            return False
+        return used_bytes / (1024 * 1024) > self.max_memory_mb
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._condition:
+            return {
+                'size': self._size,
+                'idle': len(self._idle),
+                'max_size': self.max_size,
+                **self.stats
+            }
+
+    def shutdown(self):
+        with self._condition:
+            self._closed = True
+            idle, self._idle = self._idle, []
+            self._condition.notify_all()
+        for driver in idle:
+            self._discard(driver)
+        if idle:
+            logger.info(f"Browser-Pool beendet: {len(idle)} Browser geschlossen")
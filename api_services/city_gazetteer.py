@@ -0,0 +1,89 @@
+import threading
+import logging
+from collections import deque
+from typing import Dict, Any, List, Optional, Tuple
+from api_services.location_resolver import get_location_resolver, normalize_location_text
+
+logger = logging.getLogger(__name__)
+
+class CityGazetteer:
+    def __init__(self, cities: Dict[str, Dict[str, Any]]):
+        self.cities = cities
+        self._goto = [{}]
+        self._fail = [0]
+        self._outputs = [[]]
+        for city_id, entry in cities.items():
+            for alias in [city_id, entry['name'], *entry.get('aliases', [])]:
+                normalized = normalize_location_text(alias)
+                if normalized:
+                    self._add_pattern(normalized, city_id)
+        self._build_failure_links()
+        logger.info(f"Städte-Gazetteer aufgebaut: {len(self._goto)} Zustände")
+
+    def _add_pattern(self, pattern: str, city_id: str):
+        state = 0
+        for char in pattern:
+            next_state = self._goto[state].get(char)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][char] = next_state
+                self._goto.append({})
+                self._fail.append(0)
+                self._outputs.append([])
+            state = next_state
+        if all(length != len(pattern) for length, _ in self._outputs[state]):
+            self._outputs[state].append((len(pattern), city_id))
+
+    def _build_failure_links(self):
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for char, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fallback = self._fail[state]
+                while fallback and char not in self._goto[fallback]:
+                    fallback = self._fail[fallback]
+                self._fail[next_state] = self._goto[fallback].get(char, 0)
+                self._outputs[next_state] = self._outputs[next_state] + self._outputs[self._fail[next_state]]
+
+    def _scan(self, text: str) -> List[Tuple[int, int, str]]:
+        matches = []
+        state = 0
+        for position, char in enumerate(text):
+            while state and char not in self._goto[state]:
+                state = self._fail[state]
+            state = self._goto[state].get(char, 0)
+            for length, city_id in self._outputs[state]:
+                start = position - length + 1
+                end = position + 1
+                if (start == 0 or not text[start - 1].isalnum()) and (end == len(text) or not text[end].isalnum()):
+                    matches.append((start, end, city_id))
+        return matches
+
+    def find_all(self, message: str) -> List[str]:
+        text = normalize_location_text(message)
+        found = []
+        last_end = 0
+        for start, end, city_id in sorted(self._scan(text), key=lambda match: (match[0], match[0] - match[1])):
+            if start < last_end:
+                continue
+            found.append(city_id)
+            last_end = end
+        return found
+
+    def find_first(self, message: str) -> Optional[str]:
+        found = self.find_all(message)
+        return found[0] if found else None
+
+    def display_name(self, city_id: str) -> str:
+        return self.cities[city_id]['name']
+
+_default_gazetteer = None
+_default_gazetteer_lock = threading.Lock()
+
+def get_city_gazetteer() -> CityGazetteer:
+    global _default_gazetteer
+    with _default_gazetteer_lock:
+        if _default_gazetteer is None:
+            _default_gazetteer = CityGazetteer(get_location_resolver().cities)
+        return _default_gazetteer
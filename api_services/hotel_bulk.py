@@ -0,0 +1,52 @@
+import sys
+import logging
+import argparse
+from dotenv import load_dotenv
+from api_services.hotel_service import HotelService
+
+logger = logging.getLogger(__name__)
+
+def read_locations(args) -> list:
+    locations = list(args.locations)
+    if args.file:
+        with open(args.file, 'r', encoding='utf-8') as f:
+            locations.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+    return locations
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Hotelpreise für mehrere Städte parallel aktualisieren')
+    parser.add_argument('locations', nargs='*')
+    parser.add_argument('--file', help='Datei mit einer Stadt pro Zeile')
+    parser.add_argument('--check-in')
+    parser.add_argument('--check-out')
+    parser.add_argument('--guests', type=int, default=1)
+    parser.add_argument('--workers', type=int)
+    parser.add_argument('--refresh', action='store_true', help='Auch bereits gecachte Städte neu abfragen')
+    args = parser.parse_args()
+
+    load_dotenv('config.env')
+    logging.basicConfig(level=logging.INFO)
+
+    locations = read_locations(args)
+    if not locations:
+        parser.error('Keine Städte angegeben')
+
+    hotel_service = HotelService()
+    try:
+        results = hotel_service.search_hotels_bulk(
+            locations,
+            check_in=args.check_in,
+            check_out=args.check_out,
+            guests=args.guests,
+            max_workers=args.workers,
+            refresh=args.refresh
+        )
+    finally:
+        hotel_service.shutdown()
+
+    for location, result in results.items():
+        print(f"{location:<25} {result['status']:<8} {result['hotels']:>4} Hotels")
+    return 1 if any(result['status'] == 'failed' for result in results.values()) else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
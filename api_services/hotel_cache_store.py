@@ -0,0 +1,346 @@
+import os
+import json
+import sqlite3
+import threading
+import time
+import logging
+from typing import Dict, Any, List, Optional, Callable
+from api_services.location_resolver import get_location_resolver
+
+logger = logging.getLogger(__name__)
+
+LOCATION_KEY_VERSION = 1
+
+def normalize_location_key(location: str) -> str:
+    return get_location_resolver().canonical_key(location)
+
+def build_cache_key(location: str, check_in: str, check_out: str, guests: int) -> str:
+    return f"{normalize_location_key(location)}_{check_in}_{check_out}_{guests}"
+
+class HotelCacheStore:
+    def __init__(self, db_file: str, ttl_seconds: int = 0, max_entries: int = 0, max_bytes: int = 0):
+        self.db_file = db_file
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.access_update_interval = 60
+        self.on_evict: Optional[Callable[[List[str]], None]] = None
+        self._touched = {}
+        self._row_count = 0
+        self._total_bytes = 0
+        self.stats = {'hits': 0, 'misses': 0, 'expired': 0, 'evicted': 0, 'window_hits': 0}
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(db_file, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._create_schema()
+
+    def _create_schema(self):
+        with self._lock, self._connection:
+            self._connection.execute('''
+                CREATE TABLE IF NOT EXISTS hotel_prices (
+                    cache_key TEXT PRIMARY KEY,
+                    location TEXT NOT NULL,
+                    location_key TEXT NOT NULL DEFAULT '',
+                    check_in TEXT NOT NULL,
+                    check_out TEXT NOT NULL,
+                    guests INTEGER NOT NULL,
+                    hotels TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL DEFAULT 0,
+                    size_bytes INTEGER NOT NULL DEFAULT 0
+                )
+            ''')
+            columns = {row[1] for row in self._connection.execute('PRAGMA table_info(hotel_prices)')}
+            if 'last_access' not in columns:
+                self._connection.execute('ALTER TABLE hotel_prices ADD COLUMN last_access REAL NOT NULL DEFAULT 0')
+                self._connection.execute('UPDATE hotel_prices SET last_access = created_at')
+            if 'size_bytes' not in columns:
+                self._connection.execute('ALTER TABLE hotel_prices ADD COLUMN size_bytes INTEGER NOT NULL DEFAULT 0')
+                self._connection.execute('UPDATE hotel_prices SET size_bytes = LENGTH(CAST(hotels AS BLOB))')
+            if 'location_key' not in columns:
+                self._connection.execute("ALTER TABLE hotel_prices ADD COLUMN location_key TEXT NOT NULL DEFAULT ''")
+            if self._connection.execute('PRAGMA user_version').fetchone()[0] < LOCATION_KEY_VERSION:
+                self._rebuild_location_keys()
+                self._connection.execute(f'PRAGMA user_version = {LOCATION_KEY_VERSION}')
+
+            self._connection.execute('DROP INDEX IF EXISTS idx_hotel_prices_search')
+            self._connection.execute('''
+                CREATE INDEX IF NOT EXISTS idx_hotel_prices_location_key
+                ON hotel_prices (location_key, check_in, guests)
+            ''')
+            self._connection.execute('''
+                CREATE INDEX IF NOT EXISTS idx_hotel_prices_last_access
+                ON hotel_prices (last_access)
+            ''')
+            self._connection.execute('''
+                CREATE INDEX IF NOT EXISTS idx_hotel_prices_created_at
+                ON hotel_prices (created_at)
+            ''')
+            self._refresh_totals()
+
+    def _refresh_totals(self):
+        self._row_count, self._total_bytes = self._connection.execute(
+            'SELECT COUNT(*), COALESCE(SUM(size_bytes), 0) FROM hotel_prices'
+        ).fetchone()
+
+    def _rebuild_location_keys(self):
+        rows = self._connection.execute(
+            'SELECT cache_key, location, check_in, check_out, guests FROM hotel_prices ORDER BY created_at DESC'
+        ).fetchall()
+        newest = {}
+        duplicates = []
+        for cache_key, location, check_in, check_out, guests in rows:
+            canonical_key = build_cache_key(location, check_in, check_out, guests)
+            if canonical_key in newest:
+                duplicates.append((cache_key,))
+            else:
+                newest[canonical_key] = (cache_key, normalize_location_key(location))
+
+        self._connection.executemany('DELETE FROM hotel_prices WHERE cache_key = ?', duplicates)
+        self._connection.executemany(
+            'UPDATE hotel_prices SET cache_key = ?, location_key = ? WHERE cache_key = ?',
+            [(canonical_key, location_key, cache_key) for canonical_key, (cache_key, location_key) in newest.items()]
+        )
+        if rows:
+            logger.info(f"Hotel-Cache: Schlüssel für {len(rows)} Einträge kanonisiert, {len(duplicates)} Duplikate entfernt")
+
+    def __len__(self) -> int:
+        return self._row_count
+
+    def _is_expired(self, created_at: float, now: float) -> bool:
+        return bool(self.ttl_seconds) and now - created_at > self.ttl_seconds
+
+    def get(self, cache_key: str) -> Optional[tuple]:
+        now = time.time()
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT hotels, created_at, last_access, size_bytes FROM hotel_prices WHERE cache_key = ?', (cache_key,)
+            ).fetchone()
+            if row is None:
+                self.stats['misses'] += 1
+                return None
+
+            hotels, created_at, last_access, size_bytes = row
+            if self._is_expired(created_at, now):
+                with self._connection:
+                    self._delete_keys([(cache_key, size_bytes)])
+                self.stats['expired'] += 1
+                self.stats['misses'] += 1
+                return None
+
+            if now - last_access > self.access_update_interval:
+                with self._connection:
+                    self._connection.execute('UPDATE hotel_prices SET last_access = ? WHERE cache_key = ?', (now, cache_key))
+                last_access = now
+            self._touched[cache_key] = last_access
+            self.stats['hits'] += 1
+        return json.loads(hotels), created_at
+
+    def touch(self, cache_key: str):
+        now = time.time()
+        with self._lock:
+            self.stats['hits'] += 1
+            if now - self._touched.get(cache_key, 0) <= self.access_update_interval:
+                return
+            self._touched[cache_key] = now
+            with self._connection:
+                self._connection.execute('UPDATE hotel_prices SET last_access = ? WHERE cache_key = ?', (now, cache_key))
+
+    def put(self, cache_key: str, location: str, check_in: str, check_out: str, guests: int, hotels: List[Dict[str, Any]]):
+        payload = json.dumps(hotels, ensure_ascii=False, separators=(',', ':'))
+        size_bytes = len(payload.encode('utf-8'))
+        now = time.time()
+        with self._lock, self._connection:
+            previous = self._connection.execute(
+                'SELECT size_bytes FROM hotel_prices WHERE cache_key = ?', (cache_key,)
+            ).fetchone()
+            self._connection.execute(
+                'INSERT OR REPLACE INTO hotel_prices '
+                '(cache_key, location, location_key, check_in, check_out, guests, hotels, created_at, last_access, size_bytes) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                (cache_key, location, normalize_location_key(location), check_in, check_out, guests,
+                 payload, now, now, size_bytes)
+            )
+            if previous is None:
+                self._row_count += 1
+                self._total_bytes += size_bytes
+            else:
+                self._total_bytes += size_bytes - previous[0]
+            self._evict(now)
+
+    def _delete_keys(self, victims: List[tuple]):
+        if not victims:
+            return
+        cache_keys = [cache_key for cache_key, _ in victims]
+        self._connection.executemany('DELETE FROM hotel_prices WHERE cache_key = ?', [(key,) for key in cache_keys])
+        self._row_count -= len(victims)
+        self._total_bytes -= sum(size_bytes for _, size_bytes in victims)
+        for cache_key in cache_keys:
+            self._touched.pop(cache_key, None)
+        if self.on_evict:
+            self.on_evict(cache_keys)
+
+    def _evict(self, now: float):
+        evicted = 0
+        if self.ttl_seconds:
+            victims = self._connection.execute(
+                'SELECT cache_key, size_bytes FROM hotel_prices WHERE created_at < ?', (now - self.ttl_seconds,)
+            ).fetchall()
+            self._delete_keys(victims)
+            evicted += len(victims)
+
+        if self.max_entries and self._row_count > self.max_entries:
+            victims = self._connection.execute(
+                'SELECT cache_key, size_bytes FROM hotel_prices ORDER BY last_access ASC LIMIT ?',
+                (self._row_count - self.max_entries,)
+            ).fetchall()
+            self._delete_keys(victims)
+            evicted += len(victims)
+
+        if self.max_bytes and self._total_bytes > self.max_bytes:
+            victims = []
+            excess = self._total_bytes - self.max_bytes
+            for cache_key, size_bytes in self._connection.execute(
+                'SELECT cache_key, size_bytes FROM hotel_prices ORDER BY last_access ASC'
+            ):
+                if excess <= 0:
+                    break
+                victims.append((cache_key, size_bytes))
+                excess -= size_bytes
+            self._delete_keys(victims)
+            evicted += len(victims)
+
+        if evicted:
+            self.stats['evicted'] += evicted
+            logger.info(f"Hotel-Cache: {evicted} Einträge verdrängt oder abgelaufen")
+
+    def invalidate_location(self, location: str) -> int:
+        with self._lock, self._connection:
+            cursor = self._connection.execute(
+                'DELETE FROM hotel_prices WHERE location_key = ?', (normalize_location_key(location),)
+            )
+            self._touched.clear()
+            self._refresh_totals()
+        return cursor.rowcount
+
+    def find_by_location(self, location: str, check_in_from: Optional[str] = None, check_in_to: Optional[str] = None,
+                         guests: Optional[int] = None, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        query = 'SELECT cache_key, check_in, check_out, guests, hotels FROM hotel_prices WHERE location_key = ?'
+        params = [normalize_location_key(location)]
+        if check_in_from:
+            query += ' AND check_in >= ?'
+            params.append(check_in_from)
+        if check_in_to:
+            query += ' AND check_in <= ?'
+            params.append(check_in_to)
+        if guests is not None:
+            query += ' AND guests = ?'
+            params.append(guests)
+        if self.ttl_seconds:
+            query += ' AND created_at >= ?'
+            params.append(time.time() - self.ttl_seconds)
+        query += ' ORDER BY check_in, check_out, guests LIMIT ? OFFSET ?'
+        params.extend([limit if limit is not None else -1, offset])
+
+        with self._lock:
+            rows = self._connection.execute(query, params).fetchall()
+        return [
+            {
+                'cache_key': cache_key,
+                'check_in': row_check_in,
+                'check_out': row_check_out,
+                'guests': row_guests,
+                'hotels': json.loads(hotels)
+            }
+            for cache_key, row_check_in, row_check_out, row_guests, hotels in rows
+        ]
+
+    def find_recent(self, location: str, nights: int, guests: int, max_age_seconds: float) -> Optional[Dict[str, Any]]:
+        now = time.time()
+        min_created_at = now - max_age_seconds
+        if self.ttl_seconds:
+            min_created_at = max(min_created_at, now - self.ttl_seconds)
+
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT cache_key, check_in, check_out, hotels, created_at FROM hotel_prices '
+                "WHERE location_key = ? AND guests = ? AND check_in >= date('now', 'localtime') "
+                'AND CAST(julianday(check_out) - julianday(check_in) AS INTEGER) = ? AND created_at >= ? '
+                'ORDER BY created_at DESC LIMIT 1',
+                (normalize_location_key(location), guests, nights, min_created_at)
+            ).fetchone()
+            if row is None:
+                return None
+            self.stats['window_hits'] += 1
+
+        cache_key, check_in, check_out, hotels, created_at = row
+        return {
+            'cache_key': cache_key,
+            'check_in': check_in,
+            'check_out': check_out,
+            'hotels': json.loads(hotels),
+            'created_at': created_at
+        }
+
+    def keys(self, offset: int = 0, limit: Optional[int] = None) -> List[str]:
+        with self._lock:
+            rows = self._connection.execute(
+                'SELECT cache_key FROM hotel_prices ORDER BY cache_key LIMIT ? OFFSET ?',
+                (limit if limit is not None else -1, offset)
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    def size_bytes(self) -> int:
+        return self._total_bytes
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute('DELETE FROM hotel_prices')
+            self._touched.clear()
+            self._row_count = 0
+            self._total_bytes = 0
+
+    def migrate_json(self, json_file: str) -> int:
+        if not os.path.exists(json_file):
+            return 0
+
+        with open(json_file, 'r', encoding='utf-8') as f:
+            legacy_cache = json.load(f)
+
+        rows = []
+        now = time.time()
+        for cache_key, cached_data in legacy_cache.items():
+            try:
+                location, check_in, check_out, guests = cache_key.rsplit('_', 3)
+                guests = int(guests)
+            except ValueError:
+                logger.warning(f"Ungültiger Cache-Schlüssel übersprungen: {cache_key}")
+                continue
+
+            if isinstance(cached_data, dict) and 'hotels' in cached_data:
+                cached_data = cached_data['hotels']
+
+            payload = json.dumps(cached_data, ensure_ascii=False, separators=(',', ':'))
+            rows.append((
+                build_cache_key(location, check_in, check_out, guests), location, normalize_location_key(location), check_in, check_out, guests,
+                payload, now, now, len(payload.encode('utf-8'))
+            ))
+
+        with self._lock, self._connection:
+            self._connection.executemany(
+                'INSERT OR IGNORE INTO hotel_prices '
+                '(cache_key, location, location_key, check_in, check_out, guests, hotels, created_at, last_access, size_bytes) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                rows
+            )
+            self._refresh_totals()
+            self._evict(now)
+
+        os.replace(json_file, json_file + '.migrated')
+        logger.info(f"Hotel-Cache migriert: {len(rows)} Einträge aus {json_file}")
+        return len(rows)
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,106 @@
+import re
+import logging
+from typing import Dict, Any, List, Optional
+from lxml import html as lxml_html
+
+logger = logging.getLogger(__name__)
+
+HOTEL_RESULT_SELECTOR = "a.W8vlAc.lRagtb[aria-label]"
+
+HOTEL_RESULT_XPATH = (
+    "//a[@aria-label"
+    " and contains(concat(' ', normalize-space(@class), ' '), ' W8vlAc ')"
+    " and contains(concat(' ', normalize-space(@class), ' '), ' lRagtb ')]"
+)
+
+RATING_XPATH = (
+    ".//span[contains(@class, 'KFi5wf') or contains(@aria-label, 'Bewertung')"
+    " or contains(@aria-label, 'von 5') or contains(@aria-label, 'out of 5')]"
+)
+
+HOTEL_SNAPSHOT_SCRIPT = """
+return Array.from(document.querySelectorAll(arguments[0])).map(function (anchor) {
+    var parent = anchor.parentElement;
+    var rating = parent ? parent.querySelector(
+        "span[class*='KFi5wf'], span[aria-label*='Bewertung'], span[aria-label*='von 5'], span[aria-label*='out of 5']"
+    ) : null;
+    return {
+        label: anchor.getAttribute('aria-label'),
+        rating: rating ? ((rating.textContent || '').trim() || rating.getAttribute('aria-label')) : null
+    };
+});
+"""
+
+PRICE_LABEL_PATTERN = re.compile(r'Preise ab (\d+(?:[.,]\d+)?)\s*([\$€])\s+für\s+(.+?)(?:\s+DEAL|\s+TOLLER|\s*$)')
+PRICE_LABEL_FALLBACK_PATTERN = re.compile(r'(\d+(?:[.,]\d+)?)\s*([\$€]).*?für\s+(.+?)(?:\s+DEAL|\s+TOLLER|\s*$)')
+RATING_PATTERN = re.compile(r'(\d+(?:[.,]\d+)?)')
+
+URL_REPLACEMENTS = str.maketrans({' ': '+', 'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss'})
+
+def parse_price_label(aria_label: str) -> Optional[tuple]:
+    match = PRICE_LABEL_PATTERN.search(aria_label) or PRICE_LABEL_FALLBACK_PATTERN.search(aria_label)
+    if not match:
+        return None
+
+    price = float(match.group(1).replace(',', '.'))
+    if match.group(2) == '$':
+        price = price * 0.85
+    return match.group(3).strip(), price
+
+def parse_rating(text: Optional[str]) -> float:
+    if not text:
+        return 0
+    match = RATING_PATTERN.search(text)
+    if not match:
+        return 0
+    rating = float(match.group(1).replace(',', '.'))
+    return rating if 0 <= rating <= 5 else 0
+
+def build_google_hotels_url(name: str, location: str, check_in: str, check_out: str, guests: int) -> str:
+    name_safe = name.translate(URL_REPLACEMENTS)
+    location_safe = location.translate(URL_REPLACEMENTS)
+    return f"https://www.google.com/travel/hotels?q={name_safe}+{location_safe}&checkin={check_in}&checkout={check_out}&adults={guests}&hl=de&gl=de&curr=EUR"
+
+def extract_hotels_from_snapshot(snapshot: List[Dict[str, Any]], location: str, check_in: str, check_out: str, guests: int) -> List[Dict[str, Any]]:
+    hotels = []
+    seen_hotels = set()
+
+    for entry in snapshot:
+        aria_label = entry.get('label') or ''
+        parsed = parse_price_label(aria_label)
+        if not parsed:
+            logger.debug(f"Regex-Match fehlgeschlagen für aria-label: '{aria_label}'")
+            continue
+
+        name, price = parsed
+        if name in seen_hotels:
+            continue
+        seen_hotels.add(name)
+
+        hotels.append({
+            'name': name,
+            'price': price,
+            'rating': parse_rating(entry.get('rating')),
+            'booking_links': {
+                'Google Hotels': build_google_hotels_url(name, location, check_in, check_out, guests)
+            }
+        })
+
+    logger.info(f"{len(hotels)} Hotels aus {len(snapshot)} Ergebnis-Elementen extrahiert")
+    return hotels
+
+def snapshot_from_html(page_html: str) -> List[Dict[str, Any]]:
+    tree = lxml_html.fromstring(page_html)
+    snapshot = []
+    for anchor in tree.xpath(HOTEL_RESULT_XPATH):
+        rating = None
+        parent = anchor.getparent()
+        if parent is not None:
+            rating_elements = parent.xpath(RATING_XPATH)
+            if rating_elements:
+                rating = rating_elements[0].text_content().strip() or rating_elements[0].get('aria-label')
+        snapshot.append({'label': anchor.get('aria-label'), 'rating': rating})
+    return snapshot
+
+def extract_hotels_from_html(page_html: str, location: str, check_in: str, check_out: str, guests: int) -> List[Dict[str, Any]]:
+    return extract_hotels_from_snapshot(snapshot_from_html(page_html), location, check_in, check_out, guests)
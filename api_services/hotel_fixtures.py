@@ -0,0 +1,56 @@
+import os
+import re
+import json
+import logging
+from datetime import datetime
+from typing import Dict, Any, List
+
+logger = logging.getLogger(__name__)
+
+def _fixture_slug(location: str) -> str:
+    return re.sub(r'[^a-z0-9]+', '-', location.lower()).strip('-') or 'unknown'
+
+def record_fixture(fixture_dir: str, page_html: str, snapshot: List[Dict[str, Any]], hotels: List[Dict[str, Any]],
+                   location: str, check_in: str, check_out: str, guests: int) -> str:
+    os.makedirs(fixture_dir, exist_ok=True)
+    recorded_at = datetime.now()
+    base_name = f"{_fixture_slug(location)}_{recorded_at.strftime('%Y%m%d_%H%M%S_%f')}"
+    base_path = os.path.join(fixture_dir, base_name)
+
+    with open(base_path + '.html', 'w', encoding='utf-8') as f:
+        f.write(page_html)
+
+    with open(base_path + '.json', 'w', encoding='utf-8') as f:
+        json.dump({
+            'location': location,
+            'check_in': check_in,
+            'check_out': check_out,
+            'guests': guests,
+            'recorded_at': recorded_at.isoformat(),
+            'html_file': base_name + '.html',
+            'snapshot': snapshot,
+            'expected_hotels': hotels
+        }, f, ensure_ascii=False, indent=2)
+
+    logger.info(f"Hotel-Fixture gespeichert: {base_path}")
+    return base_path
+
+def load_fixtures(fixture_dir: str) -> List[Dict[str, Any]]:
+    fixtures = []
+    if not os.path.isdir(fixture_dir):
+        return fixtures
+
+    for file_name in sorted(os.listdir(fixture_dir)):
+        if not file_name.endswith('.json'):
+            continue
+        with open(os.path.join(fixture_dir, file_name), 'r', encoding='utf-8') as f:
+            fixture = json.load(f)
+        html_path = os.path.join(fixture_dir, fixture.get('html_file', ''))
+        if fixture.get('html_file') and os.path.exists(html_path):
+            with open(html_path, 'r', encoding='utf-8') as f:
+                fixture['html'] = f.read()
+        else:
+            fixture['html'] = None
+        fixture['name'] = file_name[:-len('.json')]
+        fixtures.append(fixture)
+    return fixtures
@@ -0,0 +1,91 @@
+import threading
+import time
+import uuid
+import logging
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, Optional, Callable
+
+logger = logging.getLogger(__name__)
+
+class HotelSearchJobs:
+    def __init__(self, hotel_service, max_workers: int = 2, job_ttl_seconds: int = 3600):
+        self.hotel_service = hotel_service
+        self.job_ttl_seconds = job_ttl_seconds
+        self.executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix='hotel-scrape')
+        self.jobs = {}
+        self._lock = threading.Lock()
+
+    def submit(self, location: str, check_in: str, check_out: str, guests: int = 1,
+               on_complete: Optional[Callable[[Any], Dict[str, Any]]] = None) -> str:
+        self._prune()
+
+        job_id = uuid.uuid4().hex
+        now = time.time()
+        with self._lock:
+            self.jobs[job_id] = {
+                'id': job_id,
+                'status': 'queued',
+                'stage': 'queued',
+                'progress': 0,
+                'location': location,
+                'check_in': check_in,
+                'check_out': check_out,
+                'guests': guests,
+                'created_at': now,
+                'updated_at': now,
+                'result': None,
+                'error': None
+            }
+
+        self.executor.submit(self._run, job_id, on_complete)
+        logger.info(f"Hotelsuche für {location} als Job {job_id} eingereiht")
+        return job_id
+
+    def _update(self, job_id: str, **fields):
+        with self._lock:
+            job = self.jobs.get(job_id)
+            if job:
+                job.update(fields)
+                job['updated_at'] = time.time()
+
+    def _run(self, job_id: str, on_complete: Optional[Callable[[Any], Dict[str, Any]]]):
+        with self._lock:
+            job = dict(self.jobs[job_id])
+
+        self._update(job_id, status='running', stage='started', progress=5)
+        self.hotel_service.set_progress_callback(
+            lambda stage, percent: self._update(job_id, stage=stage, progress=percent)
+        )
+        try:
+            hotels = self.hotel_service.search_hotel_results(
+                location=job['location'],
+                check_in=job['check_in'],
+                check_out=job['check_out'],
+                guests=job['guests']
+            )
+            result = on_complete(hotels) if on_complete else {'hotels': hotels}
+            self._update(job_id, status='done', stage='done', progress=100, result=result)
+            logger.info(f"Hotel-Job {job_id} abgeschlossen: {len(hotels)} Hotels")
+        except Exception as e:
+            logger.error(f"Hotel-Job {job_id} fehlgeschlagen: {e}")
+            self._update(job_id, status='failed', stage='failed', error=str(e))
+        finally:
+            self.hotel_service.set_progress_callback(None)
+
+    def get(self, job_id: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            job = self.jobs.get(job_id)
+            return dict(job) if job else None
+
+    def _prune(self):
+        cutoff = time.time() - self.job_ttl_seconds
+        with self._lock:
+            expired = [
+                job_id for job_id, job in self.jobs.items()
+                if job['status'] in ('done', 'failed') and job['updated_at'] < cutoff
+            ]
+            for job_id in expired:
+                del self.jobs[job_id]
+
+    def shutdown(self):
+        self.executor.shutdown(wait=False, cancel_futures=True)
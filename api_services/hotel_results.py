@@ -0,0 +1,116 @@
+import threading
+import time
+import bisect
+from array import array
+from collections import OrderedDict
+from typing import Dict, Any, List, Optional
+
+class HotelResults:
+    __slots__ = ('cache_key', 'location_key', 'created_at', 'names', 'prices', 'ratings', 'links', 'extras', 'summaries')
+
+    def __init__(self, hotels: List[Dict[str, Any]], cache_key: str = '', location_key: str = '',
+                 created_at: Optional[float] = None):
+        ordered = sorted(hotels, key=lambda hotel: hotel.get('price', 0))
+        self.cache_key = cache_key
+        self.location_key = location_key
+        self.created_at = created_at if created_at is not None else time.time()
+        self.names = tuple(hotel.get('name', 'Unbekanntes Hotel') for hotel in ordered)
+        self.prices = array('d', (hotel.get('price', 0) for hotel in ordered))
+        self.ratings = array('d', (hotel.get('rating', 0) for hotel in ordered))
+        self.links = tuple((hotel.get('booking_links') or {}).get('Google Hotels') for hotel in ordered)
+        self.extras = tuple(self._extra_fields(hotel) for hotel in ordered)
+        self.summaries = {}
+
+    @staticmethod
+    def _extra_fields(hotel: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        extras = {key: value for key, value in hotel.items() if key not in ('name', 'price', 'rating', 'booking_links')}
+        other_links = {key: value for key, value in (hotel.get('booking_links') or {}).items() if key != 'Google Hotels'}
+        if other_links:
+            extras['booking_links'] = other_links
+        return extras or None
+
+    def __len__(self) -> int:
+        return len(self.names)
+
+    def __bool__(self) -> bool:
+        return bool(self.names)
+
+    def budget_end(self, budget: Optional[float] = None) -> int:
+        if not budget:
+            return len(self.names)
+        return bisect.bisect_right(self.prices, budget)
+
+    def hotel(self, index: int) -> Dict[str, Any]:
+        extras = self.extras[index]
+        booking_links = {}
+        if self.links[index]:
+            booking_links['Google Hotels'] = self.links[index]
+        hotel = {'name': self.names[index], 'price': self.prices[index], 'rating': self.ratings[index]}
+        if extras:
+            hotel.update(extras)
+            booking_links.update(extras.get('booking_links', {}))
+        hotel['booking_links'] = booking_links
+        return hotel
+
+    def to_list(self, budget: Optional[float] = None, limit: Optional[int] = None, offset: int = 0,
+                fields: Optional[List[str]] = None) -> List[Dict[str, Any]]:
+        end = self.budget_end(budget)
+        if limit is not None:
+            end = min(end, offset + limit)
+        return project_hotels([self.hotel(index) for index in range(offset, end)], fields)
+
+def project_hotels(hotels: List[Dict[str, Any]], fields: Optional[List[str]] = None, offset: int = 0,
+                   limit: Optional[int] = None) -> List[Dict[str, Any]]:
+    if offset or limit is not None:
+        hotels = hotels[offset:offset + limit if limit is not None else None]
+    if not fields:
+        return hotels
+    return [{field: hotel[field] for field in fields if field in hotel} for hotel in hotels]
+
+class HotelResultsCache:
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 0):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.stats = {'hits': 0, 'misses': 0}
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, cache_key: str) -> Optional[HotelResults]:
+        with self._lock:
+            results = self._entries.get(cache_key)
+            if results is None:
+                self.stats['misses'] += 1
+                return None
+            if self.ttl_seconds and time.time() - results.created_at > self.ttl_seconds:
+                del self._entries[cache_key]
+                self.stats['misses'] += 1
+                return None
+            self._entries.move_to_end(cache_key)
+            self.stats['hits'] += 1
+            return results
+
+    def put(self, cache_key: str, results: HotelResults):
+        if not self.max_entries:
+            return
+        with self._lock:
+            self._entries[cache_key] = results
+            self._entries.move_to_end(cache_key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def discard(self, cache_keys: List[str]):
+        with self._lock:
+            for cache_key in cache_keys:
+                self._entries.pop(cache_key, None)
+
+    def invalidate_location(self, location_key: str):
+        with self._lock:
+            for cache_key in [key for key, results in self._entries.items() if results.location_key == location_key]:
+                del self._entries[cache_key]
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
@@ -1,11 +1,12 @@
 import os
 import logging
-import json
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta
-import re
+from typing import Dict, Any, List, Optional, Callable
+from datetime import datetime, date
 import time
 import random
+import threading
+import multiprocessing
+from concurrent.futures import Future, ProcessPoolExecutor, as_completed
 from selenium import webdriver
 from selenium.webdriver.common.by import By
 from selenium.webdriver.support.ui import WebDriverWait
@@ -13,163 +14,399 @@ from selenium.webdriver.support import expected_conditions as EC
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.common.keys import Keys
 from selenium.webdriver.common.action_chains import ActionChains
+from api_services.hotel_cache_store import HotelCacheStore, build_cache_key, normalize_location_key
+from api_services.hotel_results import HotelResults, HotelResultsCache
+from api_services.location_resolver import get_location_resolver
+from api_services.trip_dates import default_trip_window
+from api_services.browser_pool import BrowserPool
+from api_services.hotel_extractor import (
+    HOTEL_RESULT_SELECTOR, HOTEL_SNAPSHOT_SCRIPT, extract_hotels_from_snapshot, extract_hotels_from_html,
+    snapshot_from_html, build_google_hotels_url
+)
+from api_services.hotel_fixtures import record_fixture
 
 logger = logging.getLogger(__name__)
 
+SPEED_PROFILES = {
+    'stealth': {
+        'delay_factor': 1.0,
+        'type_char_by_char': True,
+        'warm_up_scroll': True,
+        'cookie_timeout': 3,
+        'suggestion_timeout': 3,
+        'navigation_timeout': 5,
+        'result_timeout': 15,
+        'scroll_rounds': 5,
+        'scroll_settle_timeout': 0,
+        'stop_when_stable': False
+    },
+    'fast': {
+        'delay_factor': 0.0,
+        'type_char_by_char': False,
+        'warm_up_scroll': False,
+        'cookie_timeout': 0.5,
+        'suggestion_timeout': 2,
+        'navigation_timeout': 5,
+        'result_timeout': 10,
+        'scroll_rounds': 8,
+        'scroll_settle_timeout': 1.5,
+        'stop_when_stable': True
+    }
+}
+
 class HotelService:
     def __init__(self):
-        self.price_cache = {}
-        self.cache_file = 'hotel_prices_cache.json'
+        self.cache_file = os.getenv('HOTEL_CACHE_DB', 'hotel_prices_cache.db')
+        self.legacy_cache_file = 'hotel_prices_cache.json'
+        self.price_cache = HotelCacheStore(
+            self.cache_file,
+            ttl_seconds=int(float(os.getenv('HOTEL_CACHE_TTL_HOURS', '24')) * 3600),
+            max_entries=int(os.getenv('HOTEL_CACHE_MAX_ENTRIES', '5000')),
+            max_bytes=int(os.getenv('HOTEL_CACHE_MAX_BYTES', str(50 * 1024 * 1024)))
+        )
         self._load_cache()
+        self.results_cache = HotelResultsCache(
+            max_entries=int(os.getenv('HOTEL_RESULTS_MEMORY_ENTRIES', '256')),
+            ttl_seconds=self.price_cache.ttl_seconds
+        )
+        self.price_cache.on_evict = self.results_cache.discard
         
-        self.driver = None
+        self._local = threading.local()
+        self._inflight_searches = {}
+        self._inflight_lock = threading.Lock()
+        self.scrape_stats = {'scrapes': 0, 'deduplicated': 0, 'failed': 0}
+        self.inflight_timeout = int(os.getenv('HOTEL_INFLIGHT_TIMEOUT', '300'))
+        self.speed_profile_name = os.getenv('HOTEL_SCRAPER_PROFILE', 'stealth')
+        if self.speed_profile_name not in SPEED_PROFILES:
+            logger.warning(f"Unbekanntes Scraper-Profil '{self.speed_profile_name}', verwende 'stealth'")
+            self.speed_profile_name = 'stealth'
+        self.speed_profile = SPEED_PROFILES[self.speed_profile_name]
+        self.extraction_mode = os.getenv('HOTEL_EXTRACTION_MODE', 'script')
+        self.fixture_dir = os.getenv('HOTEL_FIXTURE_DIR', '')
+        self.location_resolver = get_location_resolver()
+        self.price_freshness_seconds = float(os.getenv('HOTEL_PRICE_FRESHNESS_HOURS', '0')) * 3600
+        self.headless = os.getenv('HOTEL_BROWSER_HEADLESS', 'true').lower() == 'true'
+        self.browser_pool = BrowserPool(
+            self._create_selenium_driver,
+            max_size=int(os.getenv('HOTEL_BROWSER_POOL_SIZE', '2')),
+            max_uses=int(os.getenv('HOTEL_BROWSER_MAX_USES', '25')),
+            max_memory_mb=int(os.getenv('HOTEL_BROWSER_MAX_MEMORY_MB', '512'))
+        )
+    
+    @property
+    def driver(self):
+        return getattr(self._local, 'driver', None)
+    
+    @driver.setter
+    def driver(self, value):
+        self._local.driver = value
+    
+    def shutdown(self):
+        self.browser_pool.shutdown()
+        self.price_cache.close()
+    
+    def set_progress_callback(self, callback: Optional[Callable[[str, int], None]]):
+        self._local.progress_callback = callback
+    
+    def _report_progress(self, stage: str, percent: int):
+        callback = getattr(self._local, 'progress_callback', None)
+        if callback:
+            try:
+                callback(stage, percent)
+            except Exception as e:
+                logger.warning(f"Fehler beim Melden des Suchfortschritts: {e}")
     
     def _load_cache(self):
         try:
-            if os.path.exists(self.cache_file):
-                with open(self.cache_file, 'r', encoding='utf-8') as f:
-                    self.price_cache = json.load(f)
-                logger.info(f"Hotel-Cache geladen: {len(self.price_cache)} Einträge")
+            migrated = self.price_cache.migrate_json(self.legacy_cache_file)
+            if migrated:
+                logger.info(f"Alter JSON-Hotel-Cache übernommen: {migrated} Einträge")
+            logger.info(f"Hotel-Cache geöffnet: {self.cache_file}")
         except Exception as e:
-            logger.error(f"Fehler beim Laden des Hotel-Caches: {e}")
-            self.price_cache = {}
+            logger.error(f"Fehler beim Migrieren des Hotel-Caches: {e}")
     
-    def _save_cache(self):
+    def _save_cache(self, cache_key: str, location: str, check_in: str, check_out: str, guests: int, results: HotelResults):
+        self.results_cache.put(cache_key, results)
         try:
-            with open(self.cache_file, 'w', encoding='utf-8') as f:
-                json.dump(self.price_cache, f, ensure_ascii=False, indent=2)
-            logger.info(f"Hotel-Cache gespeichert: {len(self.price_cache)} Einträge")
+            self.price_cache.put(cache_key, location, check_in, check_out, guests, results.to_list())
+            logger.info(f"Hotel-Cache gespeichert: {cache_key}")
         except Exception as e:
             logger.error(f"Fehler beim Speichern des Hotel-Caches: {e}")
     
     def _get_cache_key(self, location: str, check_in: str, check_out: str, guests: int) -> str:
-        return f"{location}_{check_in}_{check_out}_{guests}"
+        return build_cache_key(location, check_in, check_out, guests)
 
+    def get_cached_results(self, location: str, check_in: str, check_out: str, guests: int = 1) -> Optional[HotelResults]:
+        cache_key = self._get_cache_key(location, check_in, check_out, guests)
+        results = self.results_cache.get(cache_key)
+        if results is not None:
+            self.price_cache.touch(results.cache_key)
+            return results
+        
+        row = self.price_cache.get(cache_key)
+        if row is None:
+            return self._get_fresh_window_results(location, check_in, check_out, guests) if self.price_freshness_seconds else None
+        
+        hotels, created_at = row
+        results = HotelResults(hotels, cache_key, normalize_location_key(location), created_at)
+        logger.info(f"Hotels aus Cache geladen für {location}: {len(results)} Hotels")
+        self.results_cache.put(cache_key, results)
+        return results
+    
+    def _get_fresh_window_results(self, location: str, check_in: str, check_out: str, guests: int) -> Optional[HotelResults]:
+        try:
+            nights = (datetime.strptime(check_out, '%Y-%m-%d') - datetime.strptime(check_in, '%Y-%m-%d')).days
+        except ValueError:
+            return None
+        
+        entry = self.price_cache.find_recent(location, nights, guests, self.price_freshness_seconds)
+        if entry is None:
+            return None
+        
+        logger.info(f"Hotelpreise für {location} aus ähnlichem Zeitraum übernommen: {entry['check_in']} bis {entry['check_out']}")
+        display_location = self.location_resolver.display_name(location)
+        for hotel in entry['hotels']:
+            hotel['booking_links'] = {
+                'Google Hotels': build_google_hotels_url(hotel['name'], display_location, check_in, check_out, guests)
+            }
+        return HotelResults(
+            entry['hotels'],
+            self._get_cache_key(location, check_in, check_out, guests),
+            normalize_location_key(location),
+            entry['created_at']
+        )
+    
+    def search_hotel_results(self, location: str, check_in: Optional[str] = None,
+                             check_out: Optional[str] = None, guests: int = 1) -> HotelResults:
+        location = self.location_resolver.display_name(location)
+        if not check_in or not check_out:
+            check_in, check_out = default_trip_window()
+        
+        results = self.get_cached_results(location, check_in, check_out, guests)
+        if results is not None:
+            return results
+        
+        results = self._scrape_single_flight(location, check_in, check_out, guests)
+        logger.info(f"{len(results)} Hotels gefunden für {location} (sortiert nach Preis)")
+        return results
+    
     def search_hotels(self, location: str, check_in: Optional[str] = None, 
                      check_out: Optional[str] = None, guests: int = 1, 
                      budget: Optional[int] = None) -> List[Dict[str, Any]]:
         try:
-            if not check_in:
-                check_in = (datetime.now() + timedelta(days=7)).strftime('%Y-%m-%d')
-            if not check_out:
-                check_out = (datetime.now() + timedelta(days=14)).strftime('%Y-%m-%d')
-            
-            cache_key = self._get_cache_key(location, check_in, check_out, guests)
-            
-            if cache_key in self.price_cache:
-                cached_data = self.price_cache[cache_key]
-                logger.info(f"Hotels aus Cache geladen für {location}")
-                
-                if isinstance(cached_data, dict) and 'hotels' in cached_data:
-                    cached_hotels = cached_data['hotels']
-                    logger.info(f"Altes Cache-Format erkannt: {len(cached_hotels)} Hotels")
-                else:
-                    cached_hotels = cached_data
-                    logger.info(f"Neues Cache-Format erkannt: {len(cached_hotels)} Hotels")
-                
-                hotels = cached_hotels
-                if budget:
-                    hotels = [h for h in hotels if h.get('price', 0) <= budget]
-                hotels.sort(key=lambda x: x.get('price', 0))
-                
-                return hotels
-            
-            logger.info(f"Starte Selenium-Webscraping für Hotels in {location}")
-            
-            hotels = self._search_hotels_with_selenium(location, check_in, check_out, guests)
-            
-            logger.info(f"Hotels gefunden: {len(hotels)} Hotels")
-            
+            results = self.search_hotel_results(location, check_in, check_out, guests)
+            hotels = results.to_list(budget)
             if budget:
-                hotels = [h for h in hotels if h.get('price', 0) <= budget]
                 logger.info(f"Nach Budget-Filter: {len(hotels)} Hotels")
-            
-            hotels.sort(key=lambda x: x.get('price', 0))
-            
-            if hotels:
-                self.price_cache[cache_key] = hotels
-                self._save_cache()
-                logger.info(f"Hotels in Cache gespeichert: {len(hotels)} Hotels")
-            
-            logger.info(f"{len(hotels)} Hotels gefunden für {location} (sortiert nach Preis)")
             return hotels
             
         except Exception as e:
             logger.error(f"Fehler bei der Hotelsuche: {e}")
             return []
 
-    def get_hotel_summary(self, hotels: List[Dict[str, Any]], location: str = "", check_in: str = None, check_out: str = None, guests: int = 1) -> str:
+    def _scrape_single_flight(self, location: str, check_in: str, check_out: str, guests: int) -> HotelResults:
+        cache_key = self._get_cache_key(location, check_in, check_out, guests)
+        
+        with self._inflight_lock:
+            future = self._inflight_searches.get(cache_key)
+            is_leader = future is None
+            if is_leader:
+                future = Future()
+                self._inflight_searches[cache_key] = future
+            else:
+                self.scrape_stats['deduplicated'] += 1
+        
+        if not is_leader:
+            logger.info(f"Identische Hotelsuche läuft bereits, warte auf Ergebnis: {cache_key}")
+            return future.result(timeout=self.inflight_timeout)
+        
+        try:
+            results = self.get_cached_results(location, check_in, check_out, guests)
+            if results is None:
+                logger.info(f"Starte Selenium-Webscraping für Hotels in {location}")
+                with self._inflight_lock:
+                    self.scrape_stats['scrapes'] += 1
+                
+                hotels = self._search_hotels_with_selenium(location, check_in, check_out, guests)
+                logger.info(f"Hotels gefunden: {len(hotels)} Hotels")
+                
+                results = HotelResults(hotels, cache_key, normalize_location_key(location))
+                if results:
+                    self._save_cache(cache_key, location, check_in, check_out, guests, results)
+                    logger.info(f"Hotels in Cache gespeichert: {len(results)} Hotels")
+            
+            future.set_result(results)
+            return results
+        except Exception as e:
+            with self._inflight_lock:
+                self.scrape_stats['failed'] += 1
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight_searches.pop(cache_key, None)
+    
+    def search_hotels_bulk(self, locations: List[str], check_in: Optional[str] = None, check_out: Optional[str] = None,
+                           guests: int = 1, max_workers: Optional[int] = None, refresh: bool = False) -> Dict[str, Dict[str, Any]]:
+        if not check_in or not check_out:
+            check_in, check_out = default_trip_window()
+        
+        pending = {}
+        results = {}
+        for location in locations:
+            location = self.location_resolver.display_name(location)
+            cache_key = self._get_cache_key(location, check_in, check_out, guests)
+            if cache_key in pending or location in results:
+                continue
+            cached_hotels = None if refresh else self.get_cached_results(location, check_in, check_out, guests)
+            if cached_hotels is not None:
+                results[location] = {'status': 'cached', 'hotels': len(cached_hotels)}
+                continue
+            pending[cache_key] = location
+        
+        if not pending:
+            return results
+        
+        if max_workers is None:
+            max_workers = int(os.getenv('HOTEL_BULK_WORKERS', str(os.cpu_count() or 1)))
+        max_concurrency = int(os.getenv('HOTEL_BULK_MAX_CONCURRENCY', '4'))
+        workers = max(1, min(max_workers, max_concurrency, len(pending)))
+        logger.info(f"Starte Bulk-Hotelsuche: {len(pending)} Städte mit {workers} Prozessen")
+        
+        if _bulk_run_lock.locked():
+            logger.info("Andere Bulk-Hotelsuche läuft bereits, warte auf freie Prozesse")
+        with _bulk_run_lock:
+            started = time.time()
+            with ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'),
+                                     initializer=_init_bulk_worker) as executor:
+                futures = {
+                    executor.submit(_bulk_scrape_worker, location, check_in, check_out, guests): (cache_key, location)
+                    for cache_key, location in pending.items()
+                }
+                for future in as_completed(futures):
+                    cache_key, location = futures[future]
+                    try:
+                        hotels = future.result()
+                    except Exception as e:
+                        logger.error(f"Bulk-Hotelsuche für {location} fehlgeschlagen: {e}")
+                        with self._inflight_lock:
+                            self.scrape_stats['failed'] += 1
+                        results[location] = {'status': 'failed', 'hotels': 0, 'error': str(e)}
+                        continue
+                
+                    with self._inflight_lock:
+                        self.scrape_stats['scrapes'] += 1
+                    if hotels:
+                        hotel_results = HotelResults(hotels, cache_key, normalize_location_key(location))
+                        self._save_cache(cache_key, location, check_in, check_out, guests, hotel_results)
+                    results[location] = {'status': 'scraped' if hotels else 'empty', 'hotels': len(hotels)}
+                    logger.info(f"Bulk-Hotelsuche: {location} abgeschlossen ({len(hotels)} Hotels)")
+        
+        logger.info(f"Bulk-Hotelsuche beendet: {len(pending)} Städte in {time.time() - started:.1f}s")
+        return results
+    
+    def get_scrape_stats(self) -> Dict[str, Any]:
+        with self._inflight_lock:
+            return {
+                'in_flight': len(self._inflight_searches),
+                **self.scrape_stats
+            }
+    
+    def get_hotel_summary(self, hotels, location: str = "", check_in: str = None, check_out: str = None, guests: int = 1,
+                          top_n: int = 5, language: str = 'de') -> str:
+        if not isinstance(hotels, HotelResults):
+            hotels = HotelResults(hotels or [])
         if not hotels:
             return "Keine gut bewerteten Hotels gefunden."
         
-        hotels_sorted = sorted(hotels, key=lambda x: x.get('price', 0))
-        
-        search_info = ""
+        summary_key = (top_n, language, location, check_in, check_out, guests)
+        summary = hotels.summaries.get(summary_key)
+        if summary is None:
+            summary = self._render_hotel_summary(hotels, location, check_in, check_out, guests, top_n)
+            hotels.summaries[summary_key] = summary
+        return summary
+    
+    def _format_summary_date(self, value: str) -> str:
+        try:
+            return date.fromisoformat(value).strftime("%d.%m.%Y")
+        except ValueError:
+            return value
+    
+    def _render_hotel_summary(self, hotels: HotelResults, location: str, check_in: Optional[str], check_out: Optional[str],
+                              guests: int, top_n: int) -> str:
+        parts = []
         if check_in and check_out:
-            try:
-                from datetime import datetime
-                check_in_date = datetime.strptime(check_in, "%Y-%m-%d")
-                check_out_date = datetime.strptime(check_out, "%Y-%m-%d")
-                check_in_formatted = check_in_date.strftime("%d.%m.%Y")
-                check_out_formatted = check_out_date.strftime("%d.%m.%Y")
-                search_info = f"Zeitraum: {check_in_formatted} bis {check_out_formatted}\n Personen: {guests}\n\n"
-            except:
-                search_info = f"Zeitraum: {check_in} bis {check_out}\n Personen: {guests}\n\n"
+            parts.append(
+                f"Zeitraum: {self._format_summary_date(check_in)} bis {self._format_summary_date(check_out)}\n Personen: {guests}\n\n"
+            )
         
         location_encoded = location.replace(' ', '+')
-        main_source_link = f"Datenquelle: https://www.google.com/travel/hotels?q={location_encoded}\n\n"
+        parts.append(f"Datenquelle: https://www.google.com/travel/hotels?q={location_encoded}\n\n")
         
-        hotels_to_show = min(5, len(hotels_sorted))
-        summary = f"{search_info}{main_source_link}Gefunden: {hotels_to_show} gut bewertete Hotels (sortiert nach Preis)\n\n"
+        hotels_to_show = min(top_n, len(hotels))
+        parts.append(f"Gefunden: {hotels_to_show} gut bewertete Hotels (sortiert nach Preis)\n\n")
         
-        for i, hotel in enumerate(hotels_sorted[:5], 1):
-            name = hotel.get('name', 'Unbekanntes Hotel')
-            price = hotel.get('price', 0)
-            address = hotel.get('address', '')
-            amenities = hotel.get('amenities', [])
-            
-            summary += f"{i}. {name}\n"
-            summary += f"   Preis: {price:.0f} EUR pro Nacht\n"
-            if address:
-                summary += f"   Adresse: {address}\n"
-            if amenities:
-                amenities_str = ', '.join(amenities[:3])
-                summary += f"   Ausstattung: {amenities_str}\n"
-            
-            booking_links = hotel.get('booking_links', {})
-            if booking_links and 'Google Hotels' in booking_links:
-                summary += f"   Google Hotels: {booking_links['Google Hotels']}\n"
-            
-            summary += "\n"
+        for i, hotel in enumerate(hotels.to_list(limit=top_n), 1):
+            parts.append(f"{i}. {hotel['name']}\n")
+            parts.append(f"   Preis: {hotel['price']:.0f} EUR pro Nacht\n")
+            if hotel.get('address'):
+                parts.append(f"   Adresse: {hotel['address']}\n")
+            if hotel.get('amenities'):
+                parts.append(f"   Ausstattung: {', '.join(hotel['amenities'][:3])}\n")
+            if hotel['booking_links'].get('Google Hotels'):
+                parts.append(f"   Google Hotels: {hotel['booking_links']['Google Hotels']}\n")
+            parts.append("\n")
         
-        return summary 
+        return ''.join(parts) 
+    
+    def get_cached_entries(self, location: str, check_in_from: Optional[str] = None, check_in_to: Optional[str] = None,
+                           guests: Optional[int] = None, offset: int = 0, limit: Optional[int] = None) -> List[Dict[str, Any]]:
+        return self.price_cache.find_by_location(location, check_in_from, check_in_to, guests, offset, limit)
     
-    def get_cached_prices(self, location: str) -> List[Dict[str, Any]]:
-        cached_hotels = []
-        for cache_key, cache_data in self.price_cache.items():
-            if location.lower() in cache_key.lower():
-                cached_hotels.extend(cache_data.get('hotels', []))
-        return cached_hotels
+    def invalidate_location(self, location: str) -> int:
+        removed = self.price_cache.invalidate_location(location)
+        self.results_cache.invalidate_location(normalize_location_key(location))
+        logger.info(f"Hotel-Cache für {location} invalidiert: {removed} Einträge")
+        return removed
+    
+    def get_cache_stats(self) -> Dict[str, Any]:
+        return {
+            'entries': len(self.price_cache),
+            'size_bytes': self.price_cache.size_bytes(),
+            'ttl_seconds': self.price_cache.ttl_seconds,
+            'max_entries': self.price_cache.max_entries,
+            'max_bytes': self.price_cache.max_bytes,
+            'price_freshness_seconds': self.price_freshness_seconds,
+            'memory_entries': len(self.results_cache),
+            'memory_hits': self.results_cache.stats['hits'],
+            **self.price_cache.stats
+        }
     
     def clear_cache(self):
-        self.price_cache = {}
-        if os.path.exists(self.cache_file):
-            os.remove(self.cache_file)
+        self.price_cache.clear()
+        self.results_cache.clear()
         logger.info("Hotel-Cache gelöscht")
 
+    def _create_selenium_driver(self):
+        chrome_options = Options()
+        if self.headless:
+            chrome_options.add_argument('--headless=new')
+        chrome_options.add_argument('--no-sandbox')
+        chrome_options.add_argument('--disable-dev-shm-usage')
+        chrome_options.add_argument('--disable-blink-features=AutomationControlled')
+        chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
+        chrome_options.add_experimental_option('useAutomationExtension', False)
+        chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
+        chrome_options.add_argument('--window-size=1920,1080')
+        driver = webdriver.Chrome(options=chrome_options)
+        driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
+        logger.info("Neuer Selenium WebDriver für den Browser-Pool gestartet")
+        return driver
+    
     def _setup_selenium_driver(self):
         try:
-            chrome_options = Options()
-            chrome_options.add_argument('--no-sandbox')
-            chrome_options.add_argument('--disable-dev-shm-usage')
-            chrome_options.add_argument('--disable-blink-features=AutomationControlled')
-            chrome_options.add_experimental_option("excludeSwitches", ["enable-automation"])
-            chrome_options.add_experimental_option('useAutomationExtension', False)
-            chrome_options.add_argument('--user-agent=Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36')
-            chrome_options.add_argument('--window-size=1920,1080')
-            self.driver = webdriver.Chrome(options=chrome_options)
-            self.driver.execute_script("Object.defineProperty(navigator, 'webdriver', {get: () => undefined})")
-            logger.info("Selenium WebDriver erfolgreich eingerichtet")
+            self.driver = self.browser_pool.checkout()
+            logger.info("Selenium WebDriver aus dem Browser-Pool übernommen")
             return True
         except Exception as e:
             logger.error(f"Fehler beim Einrichten des Selenium WebDrivers: {e}")
@@ -178,14 +415,66 @@ class HotelService:
     def _close_selenium_driver(self):
         if self.driver:
             try:
-                self.driver.quit()
-                self.driver = None
-                logger.info("Selenium WebDriver geschlossen")
+                self.browser_pool.release(self.driver)
+                logger.info("Selenium WebDriver an den Browser-Pool zurückgegeben")
             except Exception as e:
-                logger.error(f"Fehler beim Schließen des WebDrivers: {e}")
+                logger.error(f"Fehler beim Zurückgeben des WebDrivers: {e}")
+            finally:
+                self.driver = None
     
     def _human_like_delay(self, min_seconds=1, max_seconds=3):
-        time.sleep(random.uniform(min_seconds, max_seconds))
+        delay_factor = self.speed_profile['delay_factor']
+        if delay_factor > 0:
+            time.sleep(random.uniform(min_seconds, max_seconds) * delay_factor)
+    
+    def _count_hotel_results(self) -> int:
+        try:
+            return self.driver.execute_script(f"return document.querySelectorAll('{HOTEL_RESULT_SELECTOR}').length;")
+        except Exception:
+            return 0
+    
+    def _wait_for_hotel_results(self) -> bool:
+        try:
+            WebDriverWait(self.driver, self.speed_profile['result_timeout']).until(
+                EC.presence_of_element_located((By.CSS_SELECTOR, HOTEL_RESULT_SELECTOR))
+            )
+            return True
+        except Exception:
+            logger.warning("Keine Hotel-Ergebnisse innerhalb der Wartezeit erschienen")
+            return False
+    
+    def _wait_for_suggestions(self) -> list:
+        try:
+            return WebDriverWait(self.driver, self.speed_profile['suggestion_timeout'], poll_frequency=0.2).until(
+                lambda driver: driver.find_elements(By.CSS_SELECTOR, 'li[data-suggestion]')
+            )
+        except Exception:
+            return []
+    
+    def _wait_for_navigation(self, previous_url: str):
+        try:
+            WebDriverWait(self.driver, self.speed_profile['navigation_timeout'], poll_frequency=0.2).until(
+                EC.url_changes(previous_url)
+            )
+        except Exception:
+            logger.info("Keine Navigation nach der Suche erkannt")
+    
+    def _scroll_until_stable(self):
+        result_count = self._count_hotel_results()
+        for round_number in range(self.speed_profile['scroll_rounds']):
+            self.driver.execute_script("window.scrollBy(0, 600);")
+            if self.speed_profile['scroll_settle_timeout']:
+                try:
+                    WebDriverWait(self.driver, self.speed_profile['scroll_settle_timeout'], poll_frequency=0.2).until(
+                        lambda driver: self._count_hotel_results() > result_count
+                    )
+                except Exception:
+                    if self.speed_profile['stop_when_stable']:
+                        logger.info(f"Keine neuen Ergebnisse nach {round_number + 1} Scroll-Runden, Scrollen beendet")
+                        break
+            result_count = self._count_hotel_results()
+            self._human_like_delay(0.5, 1.2)
+        logger.info(f"{result_count} Hotel-Ergebnisse nach dem Scrollen geladen")
     
     def _scroll_page(self):
         try:
@@ -216,91 +505,29 @@ class HotelService:
             logger.warning(f"Fehler beim Klicken auf {description}: {e}")
             return False
     
-    def _extract_rating_from_hotel_element(self, hotel_element) -> float:
-        try:
-            parent = hotel_element.find_element(By.XPATH, "./..")
-            
-            logger.info(f"Suche Rating in Parent-Element: {parent.tag_name}")
-            
-            rating_selectors = [
-                "span.KFi5wf.lA0BZ",
-                "span[class*='KFi5wf']",
-                "span[class*='lA0BZ']",
-                "span[aria-label*='Bewertung']",
-                "span[aria-label*='Rating']",
-                "span[aria-label*='Sterne']",
-                "span[aria-label*='Stars']",
-                "div[aria-label*='Bewertung']",
-                "div[aria-label*='Rating']",
-                "span[class*='rating']",
-                "div[class*='rating']",
-                "span[class*='star']",
-                "div[class*='star']",
-                "span[aria-label*='out of 5']",
-                "span[aria-label*='von 5']",
-                "span[aria-label*='5 stars']",
-                "span[aria-label*='5 Sterne']"
-            ]
-            
-            for selector in rating_selectors:
-                try:
-                    rating_elements = parent.find_elements(By.CSS_SELECTOR, selector)
-                    logger.info(f"Selektor '{selector}' gefunden: {len(rating_elements)} Elemente")
-                    
-                    for rating_elem in rating_elements:
-                        text_content = rating_elem.text.strip()
-                        if text_content:
-                            logger.info(f"Rating Text gefunden: '{text_content}'")
-                            match = re.search(r'(\d+(?:[.,]\d+)?)', text_content)
-                            if match:
-                                rating = float(match.group(1).replace(',', '.'))
-                                if 0 <= rating <= 5:
-                                    logger.info(f"Rating extrahiert: {rating}")
-                                    return rating
-                        
-                        aria_label = rating_elem.get_attribute('aria-label')
-                        if aria_label:
-                            logger.info(f"Rating aria-label gefunden: '{aria_label}'")
-                            match = re.search(r'(\d+(?:[.,]\d+)?)', aria_label)
-                            if match:
-                                rating = float(match.group(1).replace(',', '.'))
-                                if 0 <= rating <= 5:
-                                    logger.info(f"Rating extrahiert: {rating}")
-                                    return rating
-                except Exception as e:
-                    logger.warning(f"Fehler mit Selektor '{selector}': {e}")
-                    continue
-            
-            logger.info("Kein Rating gefunden, verwende Standard-Rating 4.0")
-            return 4.0
-            
-        except Exception as e:
-            logger.warning(f"Fehler beim Extrahieren des Ratings: {e}")
-            return 4.0
+    def _extract_hotels_from_page(self, location: str, check_in: str, check_out: str, guests: int) -> List[Dict[str, Any]]:
+        if self.fixture_dir:
+            return self._extract_and_record_fixture(location, check_in, check_out, guests)
+        
+        if self.extraction_mode == 'html':
+            return extract_hotels_from_html(self.driver.page_source, location, check_in, check_out, guests)
+        
+        snapshot = self.driver.execute_script(HOTEL_SNAPSHOT_SCRIPT, HOTEL_RESULT_SELECTOR) or []
+        return extract_hotels_from_snapshot(snapshot, location, check_in, check_out, guests)
     
-    def _extract_rating_alternative(self, hotel_element) -> float:
+    def _extract_and_record_fixture(self, location: str, check_in: str, check_out: str, guests: int) -> List[Dict[str, Any]]:
+        page_html = self.driver.page_source
+        if self.extraction_mode == 'html':
+            snapshot = snapshot_from_html(page_html)
+        else:
+            snapshot = self.driver.execute_script(HOTEL_SNAPSHOT_SCRIPT, HOTEL_RESULT_SELECTOR) or []
+        hotels = extract_hotels_from_snapshot(snapshot, location, check_in, check_out, guests)
+        
         try:
-            hotel_container = hotel_element.find_element(By.XPATH, "./ancestor::div[contains(@class, 'W8vlAc') or contains(@class, 'lRagtb')]")
-            
-            all_spans = hotel_container.find_elements(By.TAG_NAME, "span")
-            logger.info(f"Gefunden: {len(all_spans)} span-Elemente im Hotel-Container")
-            
-            for span in all_spans:
-                try:
-                    text_content = span.text.strip()
-                    if text_content and re.match(r'^\d+[.,]\d+$', text_content):
-                        rating = float(text_content.replace(',', '.'))
-                        if 0 <= rating <= 5:
-                            logger.info(f"Rating in span gefunden: {rating}")
-                            return rating
-                except Exception:
-                    continue
-            
-            return 4.0
-            
-        except Exception as e:
-            logger.warning(f"Fehler bei alternativer Rating-Extraktion: {e}")
-            return 4.0
+            record_fixture(self.fixture_dir, page_html, snapshot, hotels, location, check_in, check_out, guests)
+        except OSError as e:
+            logger.warning(f"Hotel-Fixture konnte nicht gespeichert werden: {e}")
+        return hotels
     
     def _accept_cookies(self):
         try:
@@ -320,7 +547,7 @@ class HotelService:
             ]
             for selector in possible_selectors:
                 try:
-                    cookie_btn = WebDriverWait(self.driver, 3).until(
+                    cookie_btn = WebDriverWait(self.driver, self.speed_profile['cookie_timeout']).until(
                         EC.element_to_be_clickable((By.CSS_SELECTOR, selector))
                     )
                     if cookie_btn:
@@ -338,9 +565,11 @@ class HotelService:
 
     def _search_hotels_with_selenium(self, location: str, check_in: str, check_out: str, guests: int) -> List[Dict[str, Any]]:
         try:
+            self._report_progress('browser', 10)
             if not self._setup_selenium_driver():
-                return []
+                raise RuntimeError("Kein Selenium WebDriver verfügbar")
             
+            self._report_progress('page_load', 20)
             self.driver.get("https://www.google.com/travel/hotels")
             self._human_like_delay(2, 4)
             
@@ -386,17 +615,22 @@ class HotelService:
                     logger.info(f"Löschen-Button nicht gefunden oder nicht klickbar: {e}")
                 
                 search_query = f"hotel {location}"
+                self._report_progress('search', 40)
                 actions = ActionChains(self.driver)
                 actions.move_to_element(search_box).click().perform()
                 self._human_like_delay(0.2, 0.5)
-                for char in search_query:
-                    actions.send_keys(char)
-                    actions.pause(random.uniform(0.1, 0.25))
-                actions.perform()
+                if self.speed_profile['type_char_by_char']:
+                    for char in search_query:
+                        actions.send_keys(char)
+                        actions.pause(random.uniform(0.1, 0.25))
+                    actions.perform()
+                else:
+                    search_box.send_keys(search_query)
+                previous_url = self.driver.current_url
                 search_box.send_keys(Keys.ENTER)
                 self._human_like_delay(2, 3)
                 
-                vorschlaege = self.driver.find_elements(By.CSS_SELECTOR, 'li[data-suggestion]')
+                vorschlaege = self._wait_for_suggestions()
                 alle_suggestions = [v.get_attribute('data-suggestion') for v in vorschlaege]
                 logger.info(f"Gefundene Vorschläge: {alle_suggestions}")
                 li_elem = None
@@ -415,85 +649,53 @@ class HotelService:
                 if li_elem:
                     try:
                         self._click_element_safely(li_elem, f"Vorschlag '{li_elem.get_attribute('data-suggestion')}'")
-                        self._human_like_delay(2, 3)
                     except Exception as e:
                         logger.warning(f"Vorschlag gefunden, aber nicht anklickbar: {e}")
                         logger.info(f"Drücke Enter nach Eintippen von: {search_query}")
                         search_box.send_keys(Keys.ENTER)
-                        self._human_like_delay(2, 3)
-                else:
+                elif self.driver.current_url == previous_url:
                     logger.warning(f"Kein passender Vorschlag gefunden. Drücke Enter nach Eintippen von: {search_query}")
                     search_box.send_keys(Keys.ENTER)
-                    self._human_like_delay(2, 3)
+                self._wait_for_navigation(previous_url)
+                self._human_like_delay(2, 3)
             except Exception as e:
                 logger.error(f"Suchfeld NICHT gefunden oder nicht anklickbar! Exception: {e}")
             
-            self._human_like_delay(3, 5)
+            self._report_progress('results', 60)
+            if not self._wait_for_hotel_results():
+                self._human_like_delay(3, 5)
             
-            self._scroll_page()
+            if self.speed_profile['warm_up_scroll']:
+                self._scroll_page()
             
-            for _ in range(5):
-                self.driver.execute_script("window.scrollBy(0, 600);")
-                self._human_like_delay(0.5, 1.2)
+            self._report_progress('scrolling', 75)
+            self._scroll_until_stable()
             
-            hotels = []
-            seen_hotels = set()
-            a_elements = self.driver.find_elements(By.CSS_SELECTOR, "a.W8vlAc.lRagtb[aria-label]")
-            logger.info(f"Gefunden: {len(a_elements)} <a>-Elemente mit Klasse 'W8vlAc lRagtb' und aria-label")
-            
-            for i, a in enumerate(a_elements):
-                try:
-                    aria_label = a.get_attribute('aria-label')
-                    logger.info(f"Verarbeite aria-label {i+1}: '{aria_label}'")
-                    match = re.search(r'Preise ab (\d+(?:[.,]\d+)?)\s*([\$€])\s+für\s+(.+?)(?:\s+DEAL|\s+TOLLER|\s*$)', aria_label)
-                    if not match:
-                        match = re.search(r'(\d+(?:[.,]\d+)?)\s*([\$€]).*?für\s+(.+?)(?:\s+DEAL|\s+TOLLER|\s*$)', aria_label)
-                    
-                    if match:
-                        price = float(match.group(1).replace(',', '.'))
-                        currency = match.group(2)
-                        name = match.group(3).strip()
-                        
-                        if currency == '$':
-                            price = price * 0.85
-                        
-                        if name in seen_hotels:
-                            logger.info(f"Hotel bereits gesehen, überspringe: {name}")
-                            continue
-                        
-                        seen_hotels.add(name)
-                        
-                        name_safe = name.replace(' ', '+').replace('ä', 'ae').replace('ö', 'oe').replace('ü', 'ue').replace('ß', 'ss')
-                        location_safe = location.replace(' ', '+').replace('ä', 'ae').replace('ö', 'oe').replace('ü', 'ue').replace('ß', 'ss')
-                        
-                        google_hotels_url = f"https://www.google.com/travel/hotels?q={name_safe}+{location_safe}&checkin={check_in}&checkout={check_out}&adults={guests}&hl=de&gl=de&curr=EUR"
-                        
-                        hotels.append({
-                            'name': name,
-                            'price': price,
-                            'rating': 0,
-                            'booking_links': {
-                                'Google Hotels': google_hotels_url
-                            }
-                        })
-                        logger.info(f"Hotel extrahiert (aria-label): {name} | {price} €")
-                    else:
-                        logger.warning(f"Regex-Match fehlgeschlagen für aria-label: '{aria_label}'")
-                except Exception as e:
-                    logger.warning(f"Fehler beim Extrahieren aus aria-label: {e}")
-            
-
+            self._report_progress('extracting', 90)
+            hotels = self._extract_hotels_from_page(location, check_in, check_out, guests)
             
             if hotels:
-                logger.info(f"{len(hotels)} Hotels erfolgreich aus aria-label extrahiert.")
+                logger.info(f"{len(hotels)} Hotels erfolgreich extrahiert ({self.extraction_mode}).")
                 return hotels
 
-            logger.warning("Keine Hotels aus aria-label extrahiert.")
+            logger.warning("Keine Hotels extrahiert.")
             return []
             
         except Exception as e:
             logger.error(f"Fehler bei Selenium-Hotelsuche: {e}")
-            return []
+            raise
         
         finally:
-            self._close_selenium_driver()
\ No newline at end of file
+            self._close_selenium_driver()
+
+_bulk_worker_service = None
+_bulk_run_lock = threading.Lock()
+
+def _init_bulk_worker():
+    global _bulk_worker_service
+    os.environ['HOTEL_BROWSER_POOL_SIZE'] = '1'
+    os.environ['HOTEL_CACHE_DB'] = ':memory:'
+    _bulk_worker_service = HotelService()
+
+def _bulk_scrape_worker(location: str, check_in: str, check_out: str, guests: int) -> List[Dict[str, Any]]:
+    return _bulk_worker_service._search_hotels_with_selenium(location, check_in, check_out, guests)
@@ -0,0 +1,84 @@
+import os
+import re
+import json
+import logging
+import threading
+from typing import Optional
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CITIES_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'cities.json')
+
+TRANSLITERATIONS = str.maketrans({
+    'ä': 'ae', 'ö': 'oe', 'ü': 'ue', 'ß': 'ss', 'ø': 'oe', 'å': 'aa', 'é': 'e', 'è': 'e', 'á': 'a',
+    'à': 'a', 'ã': 'a', 'í': 'i', 'ó': 'o', 'ú': 'u', 'ñ': 'n', 'ç': 'c', 'ı': 'i'
+})
+
+LEADING_WORDS = {'in', 'nach', 'für', 'fuer', 'von', 'aus', 'bei'}
+TRAILING_WORDS = {
+    'suchen', 'finden', 'buchen', 'abfragen', 'checken', 'prüfen', 'pruefen', 'zeigen', 'bitte',
+    'hotel', 'hotels', 'wetter', 'heute', 'morgen', 'jetzt'
+}
+NON_WORD_PATTERN = re.compile(r"[^\w\s-]")
+
+def normalize_location_text(location: str) -> str:
+    text = NON_WORD_PATTERN.sub(' ', location.lower().replace('i̇', 'i'))
+    return ' '.join(text.translate(TRANSLITERATIONS).split())
+
+class LocationResolver:
+    def __init__(self, cities_file: str = DEFAULT_CITIES_FILE):
+        self.cities_file = cities_file
+        self.cities = {}
+        self.aliases = {}
+        self._load_cities()
+
+    def _load_cities(self):
+        try:
+            with open(self.cities_file, 'r', encoding='utf-8') as f:
+                self.cities = json.load(f)
+        except Exception as e:
+            logger.error(f"Fehler beim Laden der Städteliste: {e}")
+            return
+
+        for city_id, entry in self.cities.items():
+            for alias in [city_id, entry['name'], *entry.get('aliases', [])]:
+                self.aliases.setdefault(normalize_location_text(alias), city_id)
+        logger.info(f"Städteliste geladen: {len(self.cities)} Städte, {len(self.aliases)} Schreibweisen")
+
+    def _strip_filler_words(self, words: list) -> list:
+        while len(words) > 1 and words[0].lower() in LEADING_WORDS:
+            words = words[1:]
+        while len(words) > 1 and words[-1].lower() in TRAILING_WORDS:
+            words = words[:-1]
+        return words
+
+    def resolve(self, location: Optional[str]) -> Optional[str]:
+        if not location:
+            return None
+        normalized = normalize_location_text(location)
+        city_id = self.aliases.get(normalized)
+        if city_id:
+            return city_id
+        return self.aliases.get(' '.join(self._strip_filler_words(normalized.split())))
+
+    def canonical_key(self, location: str) -> str:
+        city_id = self.resolve(location)
+        if city_id:
+            return city_id
+        return ' '.join(self._strip_filler_words(normalize_location_text(location).split()))
+
+    def display_name(self, location: str) -> str:
+        city_id = self.resolve(location)
+        if city_id:
+            return self.cities[city_id]['name']
+        return ' '.join(self._strip_filler_words(location.split()))
+
+_default_resolver = None
+_default_resolver_lock = threading.Lock()
+
+def get_location_resolver() -> LocationResolver:
+    global _default_resolver
+    with _default_resolver_lock:
+        if _default_resolver is None:
+            _default_resolver = LocationResolver(os.getenv('CITIES_FILE', DEFAULT_CITIES_FILE))
+        return _default_resolver
@@ -0,0 +1,46 @@
+import os
+from datetime import datetime, date, timedelta
+from typing import Optional, Tuple
+
+def parse_trip_date(value: Optional[str], not_before: Optional[date] = None) -> Optional[date]:
+    if not value:
+        return None
+    value = value.strip()
+    for date_format in ("%Y-%m-%d", "%d.%m.%Y"):
+        try:
+            return datetime.strptime(value, date_format).date()
+        except ValueError:
+            continue
+    try:
+        parsed = datetime.strptime(f"{value}.2000", "%d.%m.%Y")
+    except ValueError:
+        return None
+
+    not_before = not_before or datetime.now().date()
+    for year in range(not_before.year, not_before.year + 5):
+        try:
+            candidate = date(year, parsed.month, parsed.day)
+        except ValueError:
+            continue
+        if candidate >= not_before:
+            return candidate
+    return None
+
+def normalize_trip_date(value: Optional[str], not_before: Optional[date] = None) -> Optional[str]:
+    parsed = parse_trip_date(value, not_before)
+    return parsed.isoformat() if parsed else None
+
+def normalize_trip_window(start: Optional[str], end: Optional[str]) -> Tuple[Optional[str], Optional[str]]:
+    start_date = parse_trip_date(start)
+    end_date = parse_trip_date(end, start_date + timedelta(days=1) if start_date else None)
+    return (
+        start_date.isoformat() if start_date else None,
+        end_date.isoformat() if end_date else None
+    )
+
+def default_trip_window(today: Optional[date] = None) -> Tuple[str, str]:
+    today = today or datetime.now().date()
+    lead_day = today + timedelta(days=int(os.getenv('TRIP_DEFAULT_LEAD_DAYS', '7')))
+    check_in = lead_day + timedelta(days=(7 - lead_day.weekday()) % 7)
+    check_out = check_in + timedelta(days=int(os.getenv('TRIP_DEFAULT_NIGHTS', '7')))
+    return check_in.isoformat(), check_out.isoformat()
@@ -1,63 +1,323 @@
 import os
+import json
+import asyncio
+import threading
+import time
+import bisect
 import requests
 import logging
-from typing import Dict, Any, Optional
-from datetime import datetime, timedelta
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+from typing import Dict, Any, Optional, Callable, List
+from array import array
+from collections import Counter
+from datetime import datetime, date
+from concurrent.futures import ThreadPoolExecutor
+from api_services.location_resolver import get_location_resolver
+from api_services.trip_dates import parse_trip_date
 
 logger = logging.getLogger(__name__)
 
+DEFAULT_CITY_SEED_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), 'data', 'cities.json')
+
+class ForecastIndex:
+    __slots__ = ('dates', 'labels', 'positions', 'temp_min', 'temp_max', 'temp_mean', 'descriptions', 'icons', '_five_day_text')
+    
+    def __init__(self, data: Dict[str, Any]):
+        days = {}
+        for item in data['list']:
+            day = datetime.fromtimestamp(item['dt']).date()
+            days.setdefault(day, []).append(item)
+        
+        self.dates = []
+        self.labels = []
+        self.positions = {}
+        self.temp_min = array('d')
+        self.temp_max = array('d')
+        self.temp_mean = array('d')
+        self.descriptions = []
+        self.icons = []
+        self._five_day_text = None
+        
+        for day in sorted(days):
+            items = days[day]
+            temps = [item['main']['temp'] for item in items]
+            description_counts = Counter(item['weather'][0]['description'] for item in items)
+            description = description_counts.most_common(1)[0][0]
+            icon = next(item['weather'][0]['icon'] for item in items if item['weather'][0]['description'] == description)
+            
+            self.positions[day] = len(self.dates)
+            self.dates.append(day.isoformat())
+            self.labels.append(day.strftime("%d.%m"))
+            self.temp_min.append(min(temps))
+            self.temp_max.append(max(temps))
+            self.temp_mean.append(sum(temps) / len(temps))
+            self.descriptions.append(description)
+            self.icons.append(icon)
+    
+    def __len__(self) -> int:
+        return len(self.dates)
+    
+    def day(self, position: int) -> Dict[str, Any]:
+        return {
+            'date': self.dates[position],
+            'temperature': round(self.temp_mean[position]),
+            'temp_min': round(self.temp_min[position]),
+            'temp_max': round(self.temp_max[position]),
+            'description': self.descriptions[position],
+            'icon': self.icons[position]
+        }
+    
+    def for_date(self, target_date: date) -> Optional[Dict[str, Any]]:
+        position = self.positions.get(target_date)
+        if position is None:
+            return None
+        return self.day(position)
+    
+    def date_range(self, start_date: date, end_date: date) -> List[Dict[str, Any]]:
+        start = bisect.bisect_left(self.dates, start_date.isoformat())
+        end = bisect.bisect_right(self.dates, end_date.isoformat())
+        return [self.day(position) for position in range(start, end)]
+    
+    def five_day_text(self) -> str:
+        if self._five_day_text is None:
+            lines = [
+                f"• {self.labels[i]}: {round(self.temp_mean[i])}°C, {self.descriptions[i]}"
+                for i in range(min(5, len(self.dates)))
+            ]
+            self._five_day_text = "\n".join(lines)
+        return self._five_day_text
+    
+    def to_list(self) -> List[Dict[str, Any]]:
+        return [self.day(position) for position in range(len(self.dates))]
+
+class WeatherCache:
+    def __init__(self, ttls: Dict[str, int], stale_seconds: int = 300, precision: int = 2, max_entries: int = 2000):
+        self.ttls = ttls
+        self.stale_seconds = stale_seconds
+        self.precision = precision
+        self.max_entries = max_entries
+        self.stats = {'hits': 0, 'stale_hits': 0, 'misses': 0, 'refreshes': 0}
+        self._entries = {}
+        self._refreshing = set()
+        self._lock = threading.Lock()
+    
+    def _make_key(self, endpoint: str, lat: float, lon: float, lang: str) -> tuple:
+        return (endpoint, round(lat, self.precision), round(lon, self.precision), lang)
+    
+    def get_or_load(self, endpoint: str, lat: float, lon: float, lang: str, loader: Callable[[], Any]) -> Any:
+        key = self._make_key(endpoint, lat, lon, lang)
+        ttl = self.ttls.get(endpoint, 0)
+        
+        stale = False
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry:
+                stored_at, value = entry
+                age = time.time() - stored_at
+                if age < ttl:
+                    self.stats['hits'] += 1
+                    return value
+                stale = age < ttl + self.stale_seconds
+            self.stats['stale_hits' if stale else 'misses'] += 1
+        
+        if stale:
+            self._refresh_in_background(key, loader)
+            return value
+        
+        value = loader()
+        self._store(key, value)
+        return value
+    
+    def _store(self, key: tuple, value: Any):
+        if value is None:
+            return
+        with self._lock:
+            self._entries[key] = (time.time(), value)
+            if len(self._entries) > self.max_entries:
+                oldest_key = min(self._entries, key=lambda k: self._entries[k][0])
+                del self._entries[oldest_key]
+    
+    def _refresh_in_background(self, key: tuple, loader: Callable[[], Any]):
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+        
+        def refresh():
+            try:
+                with self._lock:
+                    self.stats['refreshes'] += 1
+                self._store(key, loader())
+                logger.info(f"Wetter-Cache im Hintergrund aktualisiert: {key}")
+            except Exception as e:
+                logger.warning(f"Fehler bei Hintergrund-Aktualisierung des Wetter-Caches: {e}")
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+        
+        threading.Thread(target=refresh, daemon=True).start()
+    
+    def get_stats(self) -> Dict[str, int]:
+        with self._lock:
+            return dict(self.stats)
+    
+    def clear(self):
+        with self._lock:
+            self._entries = {}
+
 class WeatherService:
     def __init__(self):
         self.api_key = os.getenv('OPENWEATHER_API_KEY')
         self.base_url = "http://api.openweathermap.org/data/2.5"
+        self.lang = 'de'
+        self.http_timeout = (
+            float(os.getenv('WEATHER_HTTP_CONNECT_TIMEOUT', '3.05')),
+            float(os.getenv('WEATHER_HTTP_READ_TIMEOUT', '10'))
+        )
+        self.http_stats = {'requests': 0, 'errors': 0, 'retries': 0}
+        self._http_stats_lock = threading.Lock()
+        self.session = self._create_http_session()
+        self._io_executor = ThreadPoolExecutor(
+            max_workers=int(os.getenv('WEATHER_IO_WORKERS', '8')),
+            thread_name_prefix='weather-io'
+        )
         
         if not self.api_key:
             logger.warning("OpenWeatherMap API Key nicht gefunden")
+        
+        self.coordinates_cache_file = os.getenv('GEOCODING_CACHE_FILE', 'geocoding_cache.json')
+        self.coordinates_seed_file = os.getenv('GEOCODING_SEED_FILE', DEFAULT_CITY_SEED_FILE)
+        self.location_resolver = get_location_resolver()
+        self.coordinates_cache = {}
+        self._geocoded_coordinates = {}
+        self._coordinates_lock = threading.Lock()
+        self._load_coordinates_cache()
+        
+        self.weather_cache = WeatherCache(
+            ttls={
+                'weather': int(os.getenv('WEATHER_CACHE_CURRENT_TTL', '600')),
+                'forecast': int(os.getenv('WEATHER_CACHE_FORECAST_TTL', '10800'))
+            },
+            stale_seconds=int(os.getenv('WEATHER_CACHE_STALE_SECONDS', '300'))
+        )
     
-    def get_weather(self, location: str, date: Optional[str] = None) -> Dict[str, Any]:
+    def _create_http_session(self) -> requests.Session:
+        retry = Retry(
+            total=int(os.getenv('WEATHER_HTTP_RETRIES', '3')),
+            backoff_factor=float(os.getenv('WEATHER_HTTP_BACKOFF_FACTOR', '0.3')),
+            status_forcelist=(429, 500, 502, 503, 504),
+            allowed_methods=frozenset(['GET']),
+            respect_retry_after_header=False,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=2,
+            pool_maxsize=int(os.getenv('WEATHER_HTTP_POOL_SIZE', '10')),
+            max_retries=retry
+        )
+        session = requests.Session()
+        session.mount('http://', adapter)
+        session.mount('https://', adapter)
+        return session
+    
+    def _http_get(self, url: str, params: Dict[str, Any]) -> requests.Response:
         try:
-            if not self.api_key:
-                return self._get_fallback_weather(location)
-            
-
-            coords = self._get_coordinates(location)
-            if not coords:
-                return self._get_fallback_weather(location)
-            
-            lat, lon = coords
-            
-
-            weather_data = self._get_current_weather(lat, lon)
-            if not weather_data:
-                return self._get_fallback_weather(location)
-            
-
-            if date:
-                forecast = self._get_forecast(lat, lon, date)
-                if forecast:
-                    weather_data.update(forecast)
-            
-            return weather_data
-            
+            response = self.session.get(url, params=params, timeout=self.http_timeout)
+            retries = getattr(response.raw, 'retries', None)
+            with self._http_stats_lock:
+                self.http_stats['requests'] += 1
+                if retries is not None:
+                    self.http_stats['retries'] += len(retries.history)
+            response.raise_for_status()
+            return response
+        except Exception:
+            with self._http_stats_lock:
+                self.http_stats['errors'] += 1
+            raise
+    
+    def get_http_stats(self) -> Dict[str, Any]:
+        pools = []
+        for adapter in set(self.session.adapters.values()):
+            pool_manager = adapter.poolmanager
+            for pool_key in list(pool_manager.pools.keys()):
+                pool = pool_manager.pools.get(pool_key)
+                if pool is None:
+                    continue
+                pools.append({
+                    'host': f"{pool.scheme}://{pool.host}:{pool.port}",
+                    'connections_opened': pool.num_connections,
+                    'requests': pool.num_requests,
+                    'free_slots': pool.pool.qsize() if pool.pool else 0
+                })
+        with self._http_stats_lock:
+            stats = dict(self.http_stats)
+        stats['pools'] = pools
+        return stats
+    
+    def _load_coordinates_cache(self):
+        try:
+            if self.coordinates_seed_file and os.path.exists(self.coordinates_seed_file):
+                with open(self.coordinates_seed_file, 'r', encoding='utf-8') as f:
+                    for city, entry in json.load(f).items():
+                        self.coordinates_cache[self._get_coordinates_cache_key(city)] = (entry['lat'], entry['lon'])
+                logger.info(f"Geocoding-Seed geladen: {len(self.coordinates_cache)} Städte")
         except Exception as e:
-            logger.error(f"Fehler bei Wetterabfrage: {e}")
-            return self._get_fallback_weather(location)
+            logger.error(f"Fehler beim Laden der Geocoding-Seed-Datei: {e}")
+        
+        try:
+            if os.path.exists(self.coordinates_cache_file):
+                with open(self.coordinates_cache_file, 'r', encoding='utf-8') as f:
+                    self._geocoded_coordinates = {city: tuple(coords) for city, coords in json.load(f).items()}
+                self.coordinates_cache.update(self._geocoded_coordinates)
+                logger.info(f"Geocoding-Cache geladen: {len(self.coordinates_cache)} Einträge")
+        except Exception as e:
+            logger.error(f"Fehler beim Laden des Geocoding-Caches: {e}")
+    
+    def _save_coordinates_cache(self):
+        try:
+            with open(self.coordinates_cache_file, 'w', encoding='utf-8') as f:
+                json.dump(self._geocoded_coordinates, f, ensure_ascii=False, indent=2)
+        except Exception as e:
+            logger.error(f"Fehler beim Speichern des Geocoding-Caches: {e}")
+    
+    def _get_coordinates_cache_key(self, location: str) -> str:
+        return self.location_resolver.canonical_key(location)
+    
+    def get_weather(self, location: str, date: Optional[str] = None) -> Dict[str, Any]:
+        bundle = self.get_weather_bundle(location)
+        weather_data = dict(bundle['weather'])
+        if date:
+            forecast = self._get_forecast(bundle['forecast'], date)
+            if forecast:
+                weather_data.update(forecast)
+        return weather_data
     
     def _get_coordinates(self, location: str) -> Optional[tuple]:
+        cache_key = self._get_coordinates_cache_key(location)
+        coords = self.coordinates_cache.get(cache_key)
+        if coords:
+            return coords
+        
         try:
             url = f"http://api.openweathermap.org/geo/1.0/direct"
             params = {
-                'q': location,
+                'q': self.location_resolver.display_name(location),
                 'limit': 1,
                 'appid': self.api_key
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            response = self._http_get(url, params)
             
             data = response.json()
             if data:
-                return (data[0]['lat'], data[0]['lon'])
+                coords = (data[0]['lat'], data[0]['lon'])
+                with self._coordinates_lock:
+                    self.coordinates_cache[cache_key] = coords
+                    self._geocoded_coordinates[cache_key] = coords
+                    self._save_coordinates_cache()
+                logger.info(f"Koordinaten für {location} im Geocoding-Cache gespeichert")
+                return coords
             
             return None
             
@@ -66,6 +326,10 @@ class WeatherService:
             return None
     
     def _get_current_weather(self, lat: float, lon: float) -> Optional[Dict[str, Any]]:
+        weather_data = self.weather_cache.get_or_load('weather', lat, lon, self.lang, lambda: self._request_current_weather(lat, lon))
+        return dict(weather_data) if weather_data else None
+    
+    def _request_current_weather(self, lat: float, lon: float) -> Optional[Dict[str, Any]]:
         try:
             url = f"{self.base_url}/weather"
             params = {
@@ -73,11 +337,10 @@ class WeatherService:
                 'lon': lon,
                 'appid': self.api_key,
                 'units': 'metric',  
-                'lang': 'de'        
+                'lang': self.lang
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            response = self._http_get(url, params)
             
             data = response.json()
             
@@ -93,7 +356,19 @@ class WeatherService:
             logger.error(f"Fehler bei aktueller Wetterabfrage: {e}")
             return None
     
-    def _get_forecast(self, lat: float, lon: float, target_date: str) -> Optional[Dict[str, Any]]:
+    def _fetch_forecast(self, lat: float, lon: float) -> Optional[ForecastIndex]:
+        return self.weather_cache.get_or_load('forecast', lat, lon, self.lang, lambda: self._build_forecast_index(self._request_forecast(lat, lon)))
+    
+    def _build_forecast_index(self, data: Optional[Dict[str, Any]]) -> Optional[ForecastIndex]:
+        try:
+            if not data:
+                return None
+            return ForecastIndex(data)
+        except Exception as e:
+            logger.error(f"Fehler beim Indizieren der Wettervorhersage: {e}")
+            return None
+    
+    def _request_forecast(self, lat: float, lon: float) -> Optional[Dict[str, Any]]:
         try:
             url = f"{self.base_url}/forecast"
             params = {
@@ -101,41 +376,41 @@ class WeatherService:
                 'lon': lon,
                 'appid': self.api_key,
                 'units': 'metric',
-                'lang': 'de'
+                'lang': self.lang
             }
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
-            
-            data = response.json()
-            
-
-            try:
-                target_dt = datetime.strptime(target_date, "%d.%m.%Y")
-            except:
-                try:
-                    target_dt = datetime.strptime(target_date, "%d.%m")
-
-                    target_dt = target_dt.replace(year=datetime.now().year + 1)
-                except:
-                    return None
+            response = self._http_get(url, params)
             
-            for item in data['list']:
-                forecast_dt = datetime.fromtimestamp(item['dt'])
-                if forecast_dt.date() == target_dt.date():
-                    return {
-                        'forecast_temperature': round(item['main']['temp']),
-                        'forecast_description': item['weather'][0]['description'],
-                        'forecast_icon': item['weather'][0]['icon'],
-                        'forecast_date': target_date
-                    }
-            
-            return None
+            return response.json()
             
         except Exception as e:
             logger.error(f"Fehler bei Wettervorhersage: {e}")
             return None
     
+    def _parse_forecast_date(self, target_date: str) -> Optional[date]:
+        return parse_trip_date(target_date)
+    
+    def _get_forecast(self, index: Optional[ForecastIndex], target_date: str) -> Optional[Dict[str, Any]]:
+        if not index:
+            return None
+        
+        target_dt = self._parse_forecast_date(target_date)
+        if not target_dt:
+            return None
+        
+        day = index.for_date(target_dt)
+        if not day:
+            return None
+        
+        return {
+            'forecast_temperature': day['temperature'],
+            'forecast_temp_min': day['temp_min'],
+            'forecast_temp_max': day['temp_max'],
+            'forecast_description': day['description'],
+            'forecast_icon': day['icon'],
+            'forecast_date': target_date
+        }
+    
     def _get_fallback_weather(self, location: str) -> Dict[str, Any]:
         return {
             'temperature': 20,
@@ -146,53 +421,105 @@ class WeatherService:
             'note': f'Wetterdaten für {location} (Simulation - API nicht verfügbar)'
         }
     
-    def _get_5day_forecast(self, location: str) -> Optional[str]:
+    def _format_5day_forecast(self, index: Optional[ForecastIndex]) -> Optional[str]:
+        if not index:
+            return None
+        return index.five_day_text()
+    
+    def get_trip_forecast(self, bundle: Dict[str, Any], start_date: str, end_date: str) -> List[Dict[str, Any]]:
+        index = bundle.get('forecast')
+        if not index:
+            return []
+        
+        start_dt = self._parse_forecast_date(start_date)
+        end_dt = self._parse_forecast_date(end_date)
+        if not start_dt or not end_dt:
+            return []
+        
+        return index.date_range(start_dt, end_dt)
+    
+    def get_weather_bundle(self, location: str) -> Dict[str, Any]:
+        return asyncio.run(self.get_weather_bundle_async(location))
+    
+    async def _run_io(self, func: Callable[..., Any], *args) -> Any:
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self._io_executor, func, *args)
+    
+    async def get_weather_bundle_async(self, location: str) -> Dict[str, Any]:
+        bundle = {
+            'location': location,
+            'coordinates': None,
+            'weather': None,
+            'forecast': None
+        }
         try:
             if not self.api_key:
-                return None
+                bundle['weather'] = self._get_fallback_weather(location)
+                return bundle
             
-            coords = self._get_coordinates(location)
+            coords = await self._run_io(self._get_coordinates, location)
             if not coords:
-                return None
+                bundle['weather'] = self._get_fallback_weather(location)
+                return bundle
             
+            bundle['coordinates'] = coords
             lat, lon = coords
             
-            url = f"{self.base_url}/forecast"
-            params = {
-                'lat': lat,
-                'lon': lon,
-                'appid': self.api_key,
-                'units': 'metric',
-                'lang': 'de'
-            }
+            weather_data, forecast_data = await asyncio.gather(
+                self._run_io(self._get_current_weather, lat, lon),
+                self._run_io(self._fetch_forecast, lat, lon)
+            )
             
-            response = requests.get(url, params=params, timeout=10)
-            response.raise_for_status()
+            bundle['weather'] = weather_data or self._get_fallback_weather(location)
+            if 'note' not in bundle['weather']:
+                bundle['forecast'] = forecast_data
             
-            data = response.json()
-            
-            forecast_summary = ""
-            seen_dates = set()
-            
-            for item in data['list']:
-                forecast_dt = datetime.fromtimestamp(item['dt'])
-                date_str = forecast_dt.strftime("%d.%m")
-                
-                if date_str not in seen_dates and len(seen_dates) < 5:
-                    seen_dates.add(date_str)
-                    temp = round(item['main']['temp'])
-                    description = item['weather'][0]['description']
-                    
-                    forecast_summary += f"• {date_str}: {temp}°C, {description}\n"
-            
-            return forecast_summary.strip()
+            return bundle
             
         except Exception as e:
-            logger.error(f"Fehler bei 5-Tage-Vorhersage: {e}")
-            return None
+            logger.error(f"Fehler bei Wetterabfrage: {e}")
+            bundle['weather'] = self._get_fallback_weather(location)
+            return bundle
+    
+    def get_weather_batch(self, locations: List[str], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        return asyncio.run(self.get_weather_batch_async(locations, max_concurrency))
     
-    def get_weather_summary(self, location: str) -> str:
-        weather = self.get_weather(location)
+    async def get_weather_batch_async(self, locations: List[str], max_concurrency: int = 8) -> List[Dict[str, Any]]:
+        semaphore = asyncio.Semaphore(max(1, max_concurrency))
+        
+        async def fetch(location: str) -> Dict[str, Any]:
+            async with semaphore:
+                try:
+                    bundle = await self.get_weather_bundle_async(location)
+                    return self._bundle_to_dict(bundle)
+                except Exception as e:
+                    logger.error(f"Fehler bei Wetterabfrage für {location}: {e}")
+                    return {
+                        'location': location,
+                        'success': False,
+                        'error': str(e)
+                    }
+        
+        return await asyncio.gather(*(fetch(location) for location in locations))
+    
+    def _bundle_to_dict(self, bundle: Dict[str, Any]) -> Dict[str, Any]:
+        weather = bundle['weather']
+        result = {
+            'location': bundle['location'],
+            'success': 'note' not in weather,
+            'coordinates': bundle['coordinates'],
+            'weather': weather,
+            'forecast': bundle['forecast'].to_list() if bundle['forecast'] else []
+        }
+        if not result['success']:
+            result['error'] = weather['note']
+        return result
+    
+    def get_weather_summary(self, location: str, bundle: Optional[Dict[str, Any]] = None,
+                            start_date: Optional[str] = None, end_date: Optional[str] = None) -> str:
+        if bundle is None:
+            bundle = self.get_weather_bundle(location)
+        weather = bundle['weather']
         
         location_title = location.title()
         
@@ -203,8 +530,17 @@ class WeatherService:
         summary += f"• Temperatur: {weather['temperature']}°C (gefühlt {weather['feels_like']}°C)\n"
         summary += f"• Beschreibung: {weather['description'].title()}"
         
-        forecast_5days = self._get_5day_forecast(location)
+        forecast_5days = self._format_5day_forecast(bundle['forecast'])
         if forecast_5days:
             summary += f"\n\n5-Tage Vorhersage:\n{forecast_5days}"
         
-        return summary 
\ No newline at end of file
+        if start_date and end_date:
+            trip_days = self.get_trip_forecast(bundle, start_date, end_date)
+            if trip_days:
+                summary += "\n\nVorhersage für Ihren Reisezeitraum:\n"
+                summary += "\n".join(
+                    f"• {datetime.strptime(day['date'], '%Y-%m-%d').strftime('%d.%m')}: {day['temp_min']}–{day['temp_max']}°C, {day['description']}"
+                    for day in trip_days
+                )
+        
+        return summary
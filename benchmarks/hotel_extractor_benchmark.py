@@ -0,0 +1,96 @@
+import os
+import sys
+import time
+import argparse
+import tracemalloc
+from typing import Dict, Any, List
+
+from api_services.hotel_extractor import extract_hotels_from_snapshot, snapshot_from_html
+from api_services.hotel_fixtures import load_fixtures
+
+DEFAULT_FIXTURE_DIR = os.getenv('HOTEL_FIXTURE_DIR', 'fixtures/hotels')
+
+def run_extraction(fixture: Dict[str, Any], mode: str) -> List[Dict[str, Any]]:
+    snapshot = snapshot_from_html(fixture['html']) if mode == 'html' else fixture['snapshot']
+    return extract_hotels_from_snapshot(
+        snapshot, fixture['location'], fixture['check_in'], fixture['check_out'], fixture['guests']
+    )
+
+def diff_hotels(expected: List[Dict[str, Any]], actual: List[Dict[str, Any]]) -> Dict[str, Any]:
+    expected_by_name = {hotel['name']: hotel for hotel in expected}
+    actual_by_name = {hotel['name']: hotel for hotel in actual}
+
+    price_mismatches = [
+        (name, expected_by_name[name]['price'], actual_by_name[name]['price'])
+        for name in expected_by_name.keys() & actual_by_name.keys()
+        if abs(expected_by_name[name]['price'] - actual_by_name[name]['price']) > 0.01
+    ]
+    return {
+        'missing': sorted(expected_by_name.keys() - actual_by_name.keys()),
+        'extra': sorted(actual_by_name.keys() - expected_by_name.keys()),
+        'price_mismatches': sorted(price_mismatches)
+    }
+
+def benchmark_fixture(fixture: Dict[str, Any], mode: str, repeat: int) -> Dict[str, Any]:
+    tracemalloc.start()
+    hotels = run_extraction(fixture, mode)
+    current_bytes, peak_bytes = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    start = time.perf_counter()
+    for _ in range(repeat):
+        run_extraction(fixture, mode)
+    elapsed = time.perf_counter() - start
+
+    return {
+        'name': fixture['name'],
+        'mode': mode,
+        'hotels': len(hotels),
+        'seconds_per_run': elapsed / repeat,
+        'hotels_per_second': len(hotels) * repeat / elapsed if elapsed else 0,
+        'peak_kb': peak_bytes / 1024,
+        'retained_kb': current_bytes / 1024,
+        'diff': diff_hotels(fixture.get('expected_hotels', []), hotels)
+    }
+
+def print_result(result: Dict[str, Any]):
+    diff = result['diff']
+    print(
+        f"{result['name']:<45} {result['mode']:<8} {result['hotels']:>4} Hotels "
+        f"{result['seconds_per_run'] * 1000:>8.2f} ms/Lauf {result['hotels_per_second']:>10.0f} Hotels/s "
+        f"Peak {result['peak_kb']:>8.1f} KB"
+    )
+    if diff['missing']:
+        print(f"    fehlend: {', '.join(diff['missing'])}")
+    if diff['extra']:
+        print(f"    zusätzlich: {', '.join(diff['extra'])}")
+    for name, expected_price, actual_price in diff['price_mismatches']:
+        print(f"    Preis abweichend: {name} erwartet {expected_price:.2f}€, extrahiert {actual_price:.2f}€")
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Offline-Benchmark für den Hotel-Extraktor')
+    parser.add_argument('fixture_dir', nargs='?', default=DEFAULT_FIXTURE_DIR)
+    parser.add_argument('--mode', choices=['snapshot', 'html', 'both'], default='both')
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    fixtures = load_fixtures(args.fixture_dir)
+    if not fixtures:
+        print(f"Keine Fixtures in {args.fixture_dir} gefunden. Aufnahme mit HOTEL_FIXTURE_DIR={args.fixture_dir} aktivieren.")
+        return 1
+
+    modes = ['snapshot', 'html'] if args.mode == 'both' else [args.mode]
+    failures = 0
+    for fixture in fixtures:
+        for mode in modes:
+            if mode == 'html' and not fixture['html']:
+                continue
+            result = benchmark_fixture(fixture, mode, max(1, args.repeat))
+            print_result(result)
+            if any(result['diff'].values()):
+                failures += 1
+
+    return 1 if failures else 0
+
+if __name__ == '__main__':
+    sys.exit(main())
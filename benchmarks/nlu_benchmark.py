@@ -0,0 +1,205 @@
+import re
+import sys
+import time
+import logging
+import argparse
+from typing import Dict, Any
+
+from api_services.trip_dates import normalize_trip_window
+from rasa_bot.rasa_handler import RasaHandler
+
+logger = logging.getLogger(__name__)
+
+SAMPLE_MESSAGES = [
+    'Hallo',
+    'Wie ist das Wetter in Paris?',
+    'Wetter in London abfragen',
+    'wetter in new york',
+    'Temperatur Berlin',
+    'Ist es warm in Rom?',
+    'Hotels in Barcelona finden',
+    'Hotels in Kopenhagen suchen',
+    'Ich möchte nach Wien Hotels suchen',
+    'Hotel suchen',
+    'vom 12.07 bis 19.07',
+    'ab 01.08.2027 bis zum 10.08.2027',
+    '24.12 bis 02.01',
+    'Reiseplan erstellen',
+    'Alles zurücksetzen',
+    'Danke, tschüss!',
+    'Was kann ich in Rom besichtigen?',
+    'Hallo, ich suche Hotels in Amsterdam finden und wie ist das Wetter in Amsterdam',
+    'Empfehlungen für Amsterdam',
+    'Wo finde ich die schönsten Sehenswürdigkeiten in Paris?',
+    'Wetter alles zurücksetzen',
+    'Wetter guten Tag',
+    'Wie ist das Wetter in Wien und Wetter in Berlin'
+]
+
+class LegacyRasaHandler:
+    def __init__(self):
+
+        self.intent_patterns = {
+            'greet': [
+                r'\b(hallo|hi|hey|guten tag|guten morgen|guten abend)\b'
+            ],
+            'get_weather': [
+                r'\b(wetter|wettervorhersage|temperatur)\s+(in|für|von)\s+([a-zA-Zäöüß\s]+)\b',
+                r'\b(wie ist das wetter)\s+(in|für|von)\s+([a-zA-Zäöüß\s]+)\b',
+                r'\b(wetter|temperatur)\s+([a-zA-Zäöüß\s]+)\b'
+            ],
+            'search_hotels': [
+                r'\b(hotels|hotel)\s+(in|in)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)\s+(finden|suchen)\b',
+                r'\b(hotel|hotels|unterkunft)\s+(suchen|finden|buchen)\b',
+                r'\b(nach)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)\s+(hotel|hotels|unterkunft)\s+(suchen|finden)\b'
+            ],
+            'goodbye': [
+                r'\b(tschüss|auf wiedersehen|bye|danke)\b'
+            ],
+            'provide_dates': [
+                r'\b(vom|ab|seit)\s+(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\s+(bis|bis zum)\s+(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\b',
+                r'\b(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\s+(bis|bis zum)\s+(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\b'
+            ],
+            'create_plan': [
+                r'\b(reiseplan|plan|planung)\s+(erstellen|machen)\b'
+            ],
+            'reset_session': [
+                r'\b(alles zurücksetzen|zurücksetzen|neu starten|neue reise)\b'
+            ]
+        }
+
+    def process_message(self, message: str, user_id: str) -> Dict[str, Any]:
+        try:
+            message_lower = message.lower().strip()
+            
+            best_intent = 'unknown'
+            best_confidence = 0.0
+            
+            for intent, patterns in self.intent_patterns.items():
+                for pattern in patterns:
+                    matches = re.findall(pattern, message_lower)
+                    if matches:
+                        if isinstance(matches[0], tuple):
+                            confidence = 0.5
+                        else:
+                            confidence = len(matches[0]) / len(message_lower) if isinstance(matches[0], str) else 0.5
+                        
+                        if confidence > best_confidence:
+                            best_confidence = confidence
+                            best_intent = intent
+            
+            if best_confidence < 0.1:
+                best_intent = 'unknown'
+                best_confidence = 0.0
+            
+            logger.info(f"Intent erkannt: {best_intent} (Confidence: {best_confidence:.2f})")
+            
+            return {
+                'intent': best_intent,
+                'confidence': best_confidence,
+                'entities': self._extract_entities(message_lower, best_intent)
+            }
+            
+        except Exception as e:
+            logger.error(f"Fehler bei der Intent-Erkennung: {e}")
+            return {
+                'intent': 'unknown',
+                'confidence': 0.0,
+                'entities': {}
+            }
+    
+    def _extract_entities(self, message: str, intent: str) -> Dict[str, Any]:
+        entities = {}
+        
+        if intent == 'get_weather':
+            weather_patterns = [
+                r'\b(wetter|wettervorhersage|temperatur)\s+(in|für|von)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)(?:\s+(?:abfragen|suchen|finden|checken|prüfen))?\b',
+                r'\b(wie ist das wetter)\s+(in|für|von)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)(?:\s+(?:abfragen|suchen|finden|checken|prüfen))?\b',
+                r'\b(wetter|temperatur)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)(?:\s+(?:abfragen|suchen|finden|checken|prüfen))?\b',
+                r'\b(regnet|sonnig|kalt|warm)\s+(in|für)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)(?:\s+(?:abfragen|suchen|finden|checken|prüfen))?\b'
+            ]
+            for pattern in weather_patterns:
+                matches = re.findall(pattern, message)
+                if matches:
+                    if len(matches[0]) == 3:
+                        location = matches[0][2].strip()
+                    elif len(matches[0]) == 2:
+                        location = matches[0][1].strip()
+                    else:
+                        continue
+                    
+                    location = re.sub(r'\s+(?:abfragen|suchen|finden|checken|prüfen)$', '', location, flags=re.IGNORECASE)
+                    entities['weather_location'] = location.strip()
+                    break
+        
+        elif intent == 'provide_dates':
+            date_patterns = [
+                r'\b(vom|ab)\s+(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\s+(bis|bis zum)\s+(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\b',
+                r'\b(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\s+(bis|bis zum)\s+(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\b'
+            ]
+            for pattern in date_patterns:
+                matches = re.findall(pattern, message)
+                if matches:
+                    start_date = matches[0][1] if len(matches[0]) == 4 else matches[0][0]
+                    end_date = matches[0][3] if len(matches[0]) == 4 else matches[0][2]
+                    start_date, end_date = normalize_trip_window(start_date, end_date)
+                    if start_date:
+                        entities['start_date'] = start_date
+                    if end_date:
+                        entities['end_date'] = end_date
+                    break
+        
+        elif intent == 'search_hotels':
+            hotel_patterns = [
+                r'\b(hotels|hotel)\s+(in|in)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)\s+(finden|suchen)\b',
+                r'\b(hotel|hotels|unterkunft)\s+(suchen|finden|buchen)\b',
+                r'\b(nach)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)\s+(hotel|hotels|unterkunft)\s+(suchen|finden)\b'
+            ]
+            for pattern in hotel_patterns:
+                matches = re.findall(pattern, message)
+                if matches:
+                    if len(matches[0]) == 4:
+                        if matches[0][0] == 'nach':
+                            entities['hotel_location'] = matches[0][1].strip()
+                        else:
+                            entities['hotel_location'] = matches[0][2].strip()
+                    elif len(matches[0]) == 2:
+                        pass
+                    break
+        
+        return entities
+
+def time_handler(handler, messages, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for message in messages:
+            handler.process_message(message, 'benchmark')
+    return (time.perf_counter() - start) / (repeat * len(messages))
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description='Micro-Benchmark für die Intent-Erkennung')
+    parser.add_argument('--repeat', type=int, default=2000)
+    args = parser.parse_args()
+
+    logging.disable(logging.INFO)
+    legacy = LegacyRasaHandler()
+    compiled = RasaHandler()
+
+    mismatches = 0
+    for message in SAMPLE_MESSAGES:
+        expected = legacy.process_message(message, 'benchmark')
+        actual = compiled.process_message(message, 'benchmark')
+        if expected != actual:
+            mismatches += 1
+            print(f"Abweichung bei '{message}':\n    alt: {expected}\n    neu: {actual}")
+
+    repeat = max(1, args.repeat)
+    legacy_seconds = time_handler(legacy, SAMPLE_MESSAGES, repeat)
+    compiled_seconds = time_handler(compiled, SAMPLE_MESSAGES, repeat)
+    print(f"Bisherige Erkennung: {legacy_seconds * 1e6:8.1f} µs/Nachricht")
+    print(f"Kompilierter Matcher: {compiled_seconds * 1e6:8.1f} µs/Nachricht")
+    print(f"Faktor: {legacy_seconds / compiled_seconds:.1f}x, Abweichungen: {mismatches}/{len(SAMPLE_MESSAGES)}")
+    return 0
+
+if __name__ == '__main__':
+    sys.exit(main())
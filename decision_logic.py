@@ -1,14 +1,49 @@
 import json
 from typing import Dict, List, Any, Optional
-from datetime import datetime, timedelta
 import re
 from api_services import ai_service
+from api_services.trip_dates import normalize_trip_date, default_trip_window
+from api_services.city_gazetteer import get_city_gazetteer
+
+SUGGESTED_DESTINATIONS = ['Wien', 'Barcelona', 'Kopenhagen', 'London', 'Paris', 'Rom', 'Amsterdam', 'Berlin', 'München', 'Hamburg']
+
+def _suggestions(*pairs) -> List[str]:
+    for _, city in pairs:
+        if city not in SUGGESTED_DESTINATIONS:
+            raise ValueError(f"Vorschlagsziel fehlt in SUGGESTED_DESTINATIONS: {city}")
+    return [template.format(city) for template, city in pairs]
+
+DEFAULT_SUGGESTIONS = _suggestions(
+    ('Wie ist das Wetter in {}?', 'Wien'),
+    ('Hotels in {} finden', 'Barcelona'),
+    ('Hotels in {} finden', 'Kopenhagen'),
+    ('Wetter in {} abfragen', 'London'),
+    ('Wo finde ich die schönsten Sehenswürdigkeiten in {}?', 'Paris'),
+    ('Was kann ich in {} besichtigen?', 'Rom'),
+    ('Empfehlungen für {}', 'Amsterdam'),
+    ('Was sollte ich in {} sehen?', 'Berlin')
+)
+HOTEL_SUGGESTIONS = _suggestions(
+    ('Hotels in {}', 'Paris'),
+    ('Unterkunft in {}', 'London'),
+    ('Hotel in {}', 'Rom'),
+    ('Hotels in {}', 'Amsterdam'),
+    ('Unterkunft in {}', 'Barcelona')
+)
+WEATHER_SUGGESTIONS = _suggestions(
+    ('Wie ist das Wetter in {}?', 'Berlin'),
+    ('Wetter in {}', 'München'),
+    ('Temperatur in {}', 'Hamburg'),
+    ('Klima in {}', 'Wien')
+)
 
 class TravelGuideDecisionLogic:
-    def __init__(self, hotel_service, weather_service, rasa_handler):
+    def __init__(self, hotel_service, weather_service, rasa_handler, hotel_jobs=None):
         self.hotel_service = hotel_service
         self.weather_service = weather_service
         self.rasa_handler = rasa_handler
+        self.hotel_jobs = hotel_jobs
+        self.city_gazetteer = get_city_gazetteer()
         self.user_sessions = {}
 
     
@@ -47,12 +82,7 @@ class TravelGuideDecisionLogic:
                     return {
                         'type': 'general',
                         'message': ollama_response,
-                        'suggestions': [
-                            'Wie ist das Wetter in Wien?',
-                            'Hotels in Barcelona finden',
-                            'Hotels in Kopenhagen finden',
-                            'Wetter in London abfragen'
-                        ]
+                        'suggestions': DEFAULT_SUGGESTIONS[:4]
                     }
                 except Exception as e:
                     return {
@@ -104,9 +134,9 @@ class TravelGuideDecisionLogic:
         if 'destination' in entities:
             session['preferences']['destination'] = self._clean_destination(entities['destination'])
         if 'start_date' in entities:
-            session['preferences']['start_date'] = entities['start_date']
+            session['preferences']['start_date'] = normalize_trip_date(entities['start_date'])
         if 'end_date' in entities:
-            session['preferences']['end_date'] = entities['end_date']
+            session['preferences']['end_date'] = normalize_trip_date(entities['end_date'])
     
     def _initialize_user_session(self) -> Dict[str, Any]:
         return {
@@ -126,16 +156,7 @@ class TravelGuideDecisionLogic:
         return {
             'type': 'greeting',
             'message': 'Hallo! Ich bin Ihr TravelGuide. Wie kann ich Ihnen helfen?',
-            'suggestions': [
-                'Wie ist das Wetter in Wien?',
-                'Hotels in Barcelona finden',
-                'Hotels in Kopenhagen finden',
-                'Wetter in London abfragen',
-                'Wo finde ich die schönsten Sehenswürdigkeiten in Paris?',
-                'Was kann ich in Rom besichtigen?',
-                'Empfehlungen für Amsterdam',
-                'Was sollte ich in Berlin sehen?'
-            ]
+            'suggestions': DEFAULT_SUGGESTIONS
         }
     
     def reset_user_session(self, user_id: str) -> Dict[str, Any]:
@@ -144,16 +165,7 @@ class TravelGuideDecisionLogic:
         return {
             'type': 'session_reset',
             'message': 'Perfekt! Lassen Sie uns eine neue Reise planen! \n\nIch helfe Ihnen gerne bei der Reiseplanung! Hier sind einige Möglichkeiten:',
-            'suggestions': [
-                'Wie ist das Wetter in Wien?',
-                'Hotels in Barcelona finden',
-                'Hotels in Kopenhagen finden',
-                'Wetter in London abfragen',
-                'Wo finde ich die schönsten Sehenswürdigkeiten in Paris?',
-                'Was kann ich in Rom besichtigen?',
-                'Empfehlungen für Amsterdam',
-                'Was sollte ich in Berlin sehen?'
-            ]
+            'suggestions': DEFAULT_SUGGESTIONS
         }
     
 
@@ -171,13 +183,7 @@ class TravelGuideDecisionLogic:
             return {
                 'type': 'missing_info',
                 'message': 'Ich konnte keine Stadt in Ihrer Nachricht finden. Bitte versuchen Sie es mit einer anderen Formulierung.',
-                'suggestions': [
-                    'Hotels in Paris',
-                    'Unterkunft in London',
-                    'Hotel in Rom',
-                    'Hotels in Amsterdam',
-                    'Unterkunft in Barcelona'
-                ]
+                'suggestions': HOTEL_SUGGESTIONS
             }
         
         try:
@@ -187,29 +193,33 @@ class TravelGuideDecisionLogic:
             guests = prefs.get('travelers', 1)
             
             if not check_in or not check_out:
-                today = datetime.now()
-                check_in = today.strftime("%Y-%m-%d")
-                check_out = (today + timedelta(days=7)).strftime("%Y-%m-%d")
-            
-            hotels = self.hotel_service.search_hotels(
-                location=location,
-                check_in=check_in,
-                check_out=check_out,
-                guests=guests
-            )
-            
-            session['search_results']['hotels'] = hotels
+                check_in, check_out = default_trip_window()
             
-            hotel_summary = self.hotel_service.get_hotel_summary(hotels, location, check_in, check_out, guests)
+            if self.hotel_jobs is not None:
+                hotels = self.hotel_service.get_cached_results(location, check_in, check_out, guests)
+                if hotels is None:
+                    job_id = self.hotel_jobs.submit(
+                        location, check_in, check_out, guests,
+                        on_complete=lambda hotels: self._build_hotel_results(session, hotels, location, check_in, check_out, guests)
+                    )
+                    return {
+                        'type': 'hotel_search_pending',
+                        'job_id': job_id,
+                        'message': f'Ich suche gerade nach Hotels in {location.title()}. Das kann einen Moment dauern – Sie können in der Zwischenzeit weiter chatten.',
+                        'suggestions': [
+                            'Wie ist das Wetter in ' + location.title() + '?',
+                            'Alles zurücksetzen'
+                        ]
+                    }
+            else:
+                hotels = self.hotel_service.search_hotel_results(
+                    location=location,
+                    check_in=check_in,
+                    check_out=check_out,
+                    guests=guests
+                )
             
-            return {
-                'type': 'hotel_results',
-                'message': hotel_summary,
-                'hotels': hotels,
-                'suggestions': [
-                    'Alles zurücksetzen'
-                ]
-            }
+            return self._build_hotel_results(session, hotels, location, check_in, check_out, guests)
             
         except Exception as e:
             return {
@@ -220,30 +230,24 @@ class TravelGuideDecisionLogic:
     
 
     
-    def _extract_location_from_message(self, message: str) -> Optional[str]:
-        cities = [
-            'paris', 'london', 'rom', 'madrid', 'barcelona', 'amsterdam', 'berlin', 'wien', 'prag', 'budapest',
-            'stockholm', 'kopenhagen', 'oslo', 'helsinki', 'warschau', 'athen', 'istanbul', 'dubai', 'tokio',
-            'singapur', 'bangkok', 'sydney', 'melbourne', 'new york', 'los angeles', 'chicago', 'miami', 'toronto',
-            'montreal', 'vancouver', 'mexiko', 'rio de janeiro', 'sao paulo', 'buenos aires', 'santiago', 'lima',
-            'bogota', 'caracas', 'havanna', 'kingston', 'port-au-prince', 'santo domingo', 'san juan', 'bridgetown',
-            'port of spain', 'georgetown', 'paramaribo', 'cayenne', 'fortaleza', 'recife', 'salvador', 'belo horizonte',
-            'brasilia', 'curitiba', 'porto alegre', 'montevideo', 'asuncion', 'la paz', 'sucre', 'lima', 'quito',
-            'guayaquil', 'bogota', 'medellin', 'cali', 'caracas', 'maracaibo', 'valencia', 'barquisimeto',
-            'maracay', 'ciudad guayana', 'maturin', 'barcelona', 'puerto la cruz', 'petare', 'baruta', 'chacao',
-            'catia la mar', 'guarenas', 'guatire', 'los teques', 'petare', 'baruta', 'chacao', 'catia la mar',
-            'guarenas', 'guatire', 'los teques', 'petare', 'baruta', 'chacao', 'catia la mar', 'guarenas',
-            'guatire', 'los teques', 'petare', 'baruta', 'chacao', 'catia la mar', 'guarenas', 'guatire',
-            'los teques', 'petare', 'baruta', 'chacao', 'catia la mar', 'guarenas', 'guatire', 'los teques'
-        ]
-        
-        message_lower = message.lower()
+    def _build_hotel_results(self, session: Dict[str, Any], hotels, location: str,
+                             check_in: str, check_out: str, guests: int) -> Dict[str, Any]:
+        session['search_results']['hotels'] = hotels
         
-        for city in cities:
-            if city in message_lower:
-                return city.title()
+        hotel_summary = self.hotel_service.get_hotel_summary(hotels, location, check_in, check_out, guests)
         
-        return None
+        return {
+            'type': 'hotel_results',
+            'message': hotel_summary,
+            'hotels': hotels,
+            'suggestions': [
+                'Alles zurücksetzen'
+            ]
+        }
+
+    def _extract_location_from_message(self, message: str) -> Optional[str]:
+        city_id = self.city_gazetteer.find_first(message)
+        return self.city_gazetteer.display_name(city_id) if city_id else None
 
     def _handle_general_question(self, message: str, user_id: str) -> Dict[str, Any]:
         session = self.user_sessions[user_id]
@@ -257,7 +261,7 @@ class TravelGuideDecisionLogic:
                 return {
                     'type': 'missing_info',
                     'message': 'Für Wetterinformationen können Sie fragen: "Wie ist das Wetter in [Ort]?"',
-                    'suggestions': ['Wie ist das Wetter in Berlin?', 'Wetter in München', 'Temperatur in Hamburg']
+                    'suggestions': WEATHER_SUGGESTIONS[:3]
                 }
 
         try:
@@ -265,16 +269,7 @@ class TravelGuideDecisionLogic:
             return {
                 'type': 'general',
                 'message': ollama_response,
-                'suggestions': [
-                    'Wie ist das Wetter in Wien?',
-                    'Hotels in Barcelona finden',
-                    'Hotels in Kopenhagen finden',
-                    'Wetter in London abfragen',
-                    'Wo finde ich die schönsten Sehenswürdigkeiten in Paris?',
-                    'Was kann ich in Rom besichtigen?',
-                    'Empfehlungen für Amsterdam',
-                    'Was sollte ich in Berlin sehen?'
-                ]
+                'suggestions': DEFAULT_SUGGESTIONS
             }
         except Exception as e:
             return {
@@ -295,21 +290,22 @@ class TravelGuideDecisionLogic:
             return {
                 'type': 'missing_info',
                 'message': 'Bitte geben Sie einen Ort für die Wetterabfrage an.',
-                'suggestions': [
-                    'Wie ist das Wetter in Berlin?',
-                    'Wetter in München',
-                    'Temperatur in Hamburg',
-                    'Klima in Wien'
-                ]
+                'suggestions': WEATHER_SUGGESTIONS
             }
         
         try:
-            weather_data = self.weather_service.get_weather(weather_location)
+            weather_bundle = self.weather_service.get_weather_bundle(weather_location)
+            weather_data = weather_bundle.get('weather')
             
             if weather_data:
                 session['search_results']['weather'] = weather_data
                 
-                weather_message = self.weather_service.get_weather_summary(weather_location)
+                weather_message = self.weather_service.get_weather_summary(
+                    weather_location,
+                    weather_bundle,
+                    start_date=session['preferences'].get('start_date'),
+                    end_date=session['preferences'].get('end_date')
+                )
                 
                 return {
                     'type': 'weather_results',
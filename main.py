@@ -1,14 +1,99 @@
 import os
+import time
+import logging
+import threading
 from datetime import datetime
+from typing import Dict, Any, Optional
+from concurrent.futures import ThreadPoolExecutor
+import schedule
 from flask import Flask, render_template, request, jsonify
 from dotenv import load_dotenv
-from decision_logic import TravelGuideDecisionLogic
+from decision_logic import TravelGuideDecisionLogic, SUGGESTED_DESTINATIONS
 from api_services.hotel_service import HotelService
 from api_services.weather_service import WeatherService
+from api_services.hotel_jobs import HotelSearchJobs
+from api_services.trip_dates import default_trip_window
+from api_services.hotel_results import HotelResults, project_hotels
 from rasa_bot.rasa_handler import RasaHandler
 
 load_dotenv('config.env')
 
+logger = logging.getLogger(__name__)
+
+MAX_HOTEL_PAGE_LIMIT = 1000
+
+class CacheWarmer:
+    def __init__(self, weather_service, hotel_service):
+        self.weather_service = weather_service
+        self.hotel_service = hotel_service
+        
+        self.enabled = os.getenv('CACHE_WARMER_ENABLED', 'true').lower() == 'true'
+        destinations = os.getenv('CACHE_WARMER_DESTINATIONS', '')
+        self.destinations = [d.strip() for d in destinations.split(',') if d.strip()] or list(SUGGESTED_DESTINATIONS)
+        self.interval_seconds = int(os.getenv('CACHE_WARMER_INTERVAL_SECONDS', '300'))
+        self.jitter_seconds = int(os.getenv('CACHE_WARMER_JITTER_SECONDS', '60'))
+        self.max_workers = max(1, int(os.getenv('CACHE_WARMER_MAX_WORKERS', '2')))
+        self.warm_hotels = os.getenv('CACHE_WARMER_HOTELS', 'false').lower() == 'true'
+        
+        self.scheduler = schedule.Scheduler()
+        self._stop_event = threading.Event()
+        self._thread = None
+    
+    def start(self):
+        if not self.enabled:
+            logger.info("Cache-Warmer deaktiviert")
+            return
+        if self._thread and self._thread.is_alive():
+            return
+        
+        self._stop_event.clear()
+        self.scheduler.clear()
+        self.scheduler.every(self.interval_seconds).to(self.interval_seconds + self.jitter_seconds).seconds.do(self.warm)
+        
+        self._thread = threading.Thread(target=self._run, name='cache-warmer', daemon=True)
+        self._thread.start()
+        logger.info(f"Cache-Warmer gestartet für {len(self.destinations)} Ziele")
+    
+    def stop(self):
+        self._stop_event.set()
+        self.scheduler.clear()
+        if self._thread:
+            self._thread.join(timeout=5)
+            self._thread = None
+        logger.info("Cache-Warmer gestoppt")
+    
+    def _run(self):
+        self.warm()
+        while not self._stop_event.is_set():
+            self.scheduler.run_pending()
+            self._stop_event.wait(1)
+    
+    def warm(self):
+        started = time.time()
+        with ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix='cache-warmer') as executor:
+            list(executor.map(self._warm_destination, self.destinations))
+        logger.info(f"Cache-Warmer Durchlauf beendet in {time.time() - started:.1f}s")
+    
+    def _warm_destination(self, destination: str):
+        if self._stop_event.is_set():
+            return
+        try:
+            self.weather_service.get_weather_bundle(destination)
+        except Exception as e:
+            logger.warning(f"Cache-Warmer: Wetter für {destination} fehlgeschlagen: {e}")
+        
+        if not self.warm_hotels or self._stop_event.is_set():
+            return
+        try:
+            check_in, check_out = default_trip_window()
+            self.hotel_service.search_hotels(
+                location=destination,
+                check_in=check_in,
+                check_out=check_out
+            )
+        except Exception as e:
+            logger.warning(f"Cache-Warmer: Hotels für {destination} fehlgeschlagen: {e}")
+
 class TravelGuideApp:
     def __init__(self):
         self.app = Flask(__name__, static_folder='static')
@@ -22,16 +107,59 @@ class TravelGuideApp:
             self.hotel_service = HotelService()
             self.weather_service = WeatherService()
             self.rasa_handler = RasaHandler()
+            self.hotel_jobs = HotelSearchJobs(
+                self.hotel_service,
+                max_workers=int(os.getenv('HOTEL_SCRAPE_WORKERS', '2'))
+            )
             
             self.decision_logic = TravelGuideDecisionLogic(
                 hotel_service=self.hotel_service,
                 weather_service=self.weather_service,
-                rasa_handler=self.rasa_handler
+                rasa_handler=self.rasa_handler,
+                hotel_jobs=self.hotel_jobs
+            )
+            
+            self.cache_warmer = CacheWarmer(
+                weather_service=self.weather_service,
+                hotel_service=self.hotel_service
             )
             
         except Exception as e:
             raise
     
+    def _int_arg(self, source, name: str, default: Optional[int]) -> Optional[int]:
+        try:
+            return int(source[name])
+        except (KeyError, TypeError, ValueError):
+            return default
+    
+    def _page_limit(self, source, name: str, default: Optional[int]) -> Optional[int]:
+        limit = self._int_arg(source, name, default)
+        return None if limit is None else min(max(1, limit), MAX_HOTEL_PAGE_LIMIT)
+    
+    def _hotel_page_args(self, default_limit: Optional[int] = None, source=None) -> tuple:
+        source = request.args if source is None else source
+        offset = max(0, self._int_arg(source, 'offset', 0))
+        fields = source.get('fields') or []
+        if isinstance(fields, str):
+            fields = fields.split(',')
+        fields = [field.strip() for field in fields if isinstance(field, str) and field.strip()]
+        return offset, self._page_limit(source, 'limit', default_limit), fields or None
+    
+    def _render_hotels(self, response: Dict[str, Any], compact: bool, source=None) -> Dict[str, Any]:
+        if not isinstance(response, dict) or 'hotels' not in response:
+            return response
+        hotels = response['hotels']
+        rendered = {key: value for key, value in response.items() if key != 'hotels'}
+        rendered['hotel_count'] = len(hotels)
+        if not compact:
+            offset, limit, fields = self._hotel_page_args(source=source)
+            if isinstance(hotels, HotelResults):
+                rendered['hotels'] = hotels.to_list(limit=limit, offset=offset, fields=fields)
+            else:
+                rendered['hotels'] = project_hotels(hotels, fields, offset, limit)
+        return rendered
+    
     def _setup_routes(self):
         @self.app.route('/')
         def index():
@@ -56,7 +184,9 @@ class TravelGuideApp:
                         'error': 'Empty message'
                     }), 400
                 
-                response = self.decision_logic.process_user_message(message, user_id)
+                response = self._render_hotels(
+                    self.decision_logic.process_user_message(message, user_id), bool(data.get('compact')), data
+                )
                 
                 return jsonify({
                     'success': True,
@@ -79,21 +209,81 @@ class TravelGuideApp:
         
 
         
+        @self.app.route('/api/weather/batch', methods=['POST'])
+        def weather_batch():
+            try:
+                data = request.get_json()
+                locations = data.get('locations') if data else None
+                if not locations or not isinstance(locations, list):
+                    return jsonify({
+                        'success': False,
+                        'error': 'No locations provided'
+                    }), 400
+                
+                locations = list(dict.fromkeys(str(location).strip() for location in locations if str(location).strip()))
+                max_locations = int(os.getenv('WEATHER_BATCH_MAX_LOCATIONS', '50'))
+                if len(locations) > max_locations:
+                    return jsonify({
+                        'success': False,
+                        'error': f'Too many locations (max {max_locations})'
+                    }), 400
+                
+                results = self.weather_service.get_weather_batch(
+                    locations,
+                    max_concurrency=int(os.getenv('WEATHER_BATCH_CONCURRENCY', '8'))
+                )
+                
+                return jsonify({
+                    'success': True,
+                    'count': len(results),
+                    'failed': sum(1 for result in results if not result['success']),
+                    'results': results,
+                    'timestamp': datetime.now().isoformat()
+                })
+                
+            except Exception as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 500
+        
+        @self.app.route('/api/weather/stats', methods=['GET'])
+        def weather_stats():
+            try:
+                return jsonify({
+                    'success': True,
+                    'http': self.weather_service.get_http_stats(),
+                    'cache': self.weather_service.weather_cache.get_stats(),
+                    'timestamp': datetime.now().isoformat()
+                })
+                
+            except Exception as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 500
+        
         @self.app.route('/api/test/hotels', methods=['GET'])
         def test_hotels():
             try:
                 location = request.args.get('location', 'Berlin')
+                offset, limit, fields = self._hotel_page_args(3)
                 hotels = self.hotel_service.search_hotels(location=location)
                 
                 return jsonify({
                     'success': True,
                     'location': location,
                     'hotels_found': len(hotels),
-                    'hotels': hotels[:3],
+                    'hotels': project_hotels(hotels, fields, offset, limit),
+                    'offset': offset,
+                    'limit': limit,
                     'cache_info': {
                         'cached_entries': len(self.hotel_service.price_cache),
-                        'cache_file': self.hotel_service.cache_file
+                        'cache_file': self.hotel_service.cache_file,
+                        'stats': self.hotel_service.get_cache_stats()
                     },
+                    'browser_pool': self.hotel_service.browser_pool.get_stats(),
+                    'scrape_stats': self.hotel_service.get_scrape_stats(),
                     'timestamp': datetime.now().isoformat()
                 })
                 
@@ -108,8 +298,9 @@ class TravelGuideApp:
         def test_hotel_scraping():
             try:
                 location = request.args.get('location', 'Berlin')
+                offset, limit, fields = self._hotel_page_args(5)
                 
-                self.hotel_service.clear_cache()
+                self.hotel_service.invalidate_location(location)
                 
                 hotels = self.hotel_service.search_hotels(location=location)
                 
@@ -117,7 +308,9 @@ class TravelGuideApp:
                     'success': True,
                     'location': location,
                     'hotels_found': len(hotels),
-                    'hotels': hotels[:5],
+                    'hotels': project_hotels(hotels, fields, offset, limit),
+                    'offset': offset,
+                    'limit': limit,
                     'scraping_test': True,
                     'timestamp': datetime.now().isoformat()
                 })
@@ -133,8 +326,9 @@ class TravelGuideApp:
         def test_hotel_debug():
             try:
                 location = request.args.get('location', 'Berlin')
+                offset, limit, fields = self._hotel_page_args(3)
                 
-                self.hotel_service.clear_cache()
+                self.hotel_service.invalidate_location(location)
                 
                 hotels = self.hotel_service.search_hotels(location=location)
                 
@@ -142,7 +336,9 @@ class TravelGuideApp:
                     'success': True,
                     'location': location,
                     'hotels_found': len(hotels),
-                    'hotels': hotels[:3],
+                    'hotels': project_hotels(hotels, fields, offset, limit),
+                    'offset': offset,
+                    'limit': limit,
                     'debug_mode': True,
                     'timestamp': datetime.now().isoformat()
                 })
@@ -154,25 +350,68 @@ class TravelGuideApp:
                     'timestamp': datetime.now().isoformat()
                 }), 500
         
+        @self.app.route('/api/hotels/jobs/<job_id>', methods=['GET'])
+        def get_hotel_job(job_id):
+            job = self.hotel_jobs.get(job_id)
+            if not job:
+                return jsonify({
+                    'success': False,
+                    'error': 'Job not found'
+                }), 404
+            
+            response = self._render_hotels(job['result'], request.args.get('compact', '').lower() in ('1', 'true'))
+            
+            return jsonify({
+                'success': True,
+                'job_id': job['id'],
+                'status': job['status'],
+                'stage': job['stage'],
+                'progress': job['progress'],
+                'location': job['location'],
+                'response': response,
+                'error': job['error']
+            })
+        
         @self.app.route('/api/hotels/cache', methods=['GET'])
         def get_hotel_cache():
             try:
                 location = request.args.get('location', '')
+                offset, limit, fields = self._hotel_page_args(100)
+                hotel_limit = self._page_limit(request.args, 'hotel_limit', None)
                 
                 if location:
-                    cached_hotels = self.hotel_service.get_cached_prices(location)
+                    entries = self.hotel_service.get_cached_entries(
+                        location,
+                        check_in_from=request.args.get('check_in_from'),
+                        check_in_to=request.args.get('check_in_to'),
+                        guests=request.args.get('guests', type=int),
+                        offset=offset,
+                        limit=limit
+                    )
+                    cached_hotels = [
+                        hotel
+                        for entry in entries
+                        for hotel in project_hotels(entry['hotels'], fields, 0, hotel_limit)
+                    ]
                     return jsonify({
                         'success': True,
                         'location': location,
                         'cached_hotels': cached_hotels,
-                        'count': len(cached_hotels)
+                        'count': len(cached_hotels),
+                        'cache_keys': [entry['cache_key'] for entry in entries],
+                        'offset': offset,
+                        'limit': limit
                     })
                 else:
                     return jsonify({
                         'success': True,
                         'cache_entries': len(self.hotel_service.price_cache),
-                        'cache_keys': list(self.hotel_service.price_cache.keys()),
-                        'cache_file': self.hotel_service.cache_file
+                        'cache_keys': self.hotel_service.price_cache.keys(offset=offset, limit=limit),
+                        'offset': offset,
+                        'limit': limit,
+                        'cache_file': self.hotel_service.cache_file,
+                        'stats': self.hotel_service.get_cache_stats(),
+                        'scrape_stats': self.hotel_service.get_scrape_stats()
                     })
                 
             except Exception as e:
@@ -181,6 +420,30 @@ class TravelGuideApp:
                     'error': str(e)
                 }), 500
         
+        @self.app.route('/api/hotels/cache/invalidate', methods=['POST'])
+        def invalidate_hotel_cache():
+            try:
+                data = request.get_json() or {}
+                location = str(data.get('location', '')).strip()
+                if not location:
+                    return jsonify({
+                        'success': False,
+                        'error': 'No location provided'
+                    }), 400
+                
+                removed = self.hotel_service.invalidate_location(location)
+                return jsonify({
+                    'success': True,
+                    'location': location,
+                    'removed_entries': removed
+                })
+                
+            except Exception as e:
+                return jsonify({
+                    'success': False,
+                    'error': str(e)
+                }), 500
+        
         @self.app.route('/api/hotels/cache/clear', methods=['POST'])
         def clear_hotel_cache():
             try:
@@ -199,10 +462,16 @@ class TravelGuideApp:
     def run(self, host='127.0.0.1', port=5001):
         print("TravelGuide wird gestartet...")
         print(f"Web-Interface verfügbar unter: http://localhost:{port}")
-        self.app.run(
-            host=host,
-            port=port
-        )
+        self.cache_warmer.start()
+        try:
+            self.app.run(
+                host=host,
+                port=port
+            )
+        finally:
+            self.cache_warmer.stop()
+            self.hotel_jobs.shutdown()
+            self.hotel_service.shutdown()
 
 def main():
     try:
@@ -1,9 +1,14 @@
 import re
 import logging
 from typing import Dict, Any
+from api_services.trip_dates import normalize_trip_window
 
 logger = logging.getLogger(__name__)
 
+LOCATION = r'[a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?'
+LOCATION_SUFFIX = r'(?:\s+(?:abfragen|suchen|finden|checken|prüfen))?'
+DATE = r'\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2}'
+
 class RasaHandler:
     def __init__(self):
 
@@ -12,21 +17,21 @@ class RasaHandler:
                 r'\b(hallo|hi|hey|guten tag|guten morgen|guten abend)\b'
             ],
             'get_weather': [
-                r'\b(wetter|wettervorhersage|temperatur)\s+(in|für|von)\s+([a-zA-Zäöüß\s]+)\b',
-                r'\b(wie ist das wetter)\s+(in|für|von)\s+([a-zA-Zäöüß\s]+)\b',
-                r'\b(wetter|temperatur)\s+([a-zA-Zäöüß\s]+)\b'
+                rf'\b(wetter|wettervorhersage|temperatur)\s+(in|für|von)\s+(?P<weather_location>{LOCATION}){LOCATION_SUFFIX}\b',
+                rf'\b(wie ist das wetter)\s+(in|für|von)\s+(?P<weather_location>{LOCATION}){LOCATION_SUFFIX}\b',
+                rf'\b(wetter|temperatur)\s+(?P<weather_location>{LOCATION}){LOCATION_SUFFIX}\b'
             ],
             'search_hotels': [
-                r'\b(hotels|hotel)\s+(in|in)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)\s+(finden|suchen)\b',
+                rf'\b(hotels|hotel)\s+(in|in)\s+(?P<hotel_location>{LOCATION})\s+(finden|suchen)\b',
                 r'\b(hotel|hotels|unterkunft)\s+(suchen|finden|buchen)\b',
-                r'\b(nach)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)\s+(hotel|hotels|unterkunft)\s+(suchen|finden)\b'
+                rf'\b(nach)\s+(?P<hotel_location>{LOCATION})\s+(hotel|hotels|unterkunft)\s+(suchen|finden)\b'
             ],
             'goodbye': [
                 r'\b(tschüss|auf wiedersehen|bye|danke)\b'
             ],
             'provide_dates': [
-                r'\b(vom|ab|seit)\s+(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\s+(bis|bis zum)\s+(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\b',
-                r'\b(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\s+(bis|bis zum)\s+(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\b'
+                rf'\b(vom|ab|seit)\s+(?P<start_date>{DATE})\s+(bis|bis zum)\s+(?P<end_date>{DATE})\b',
+                rf'\b(?P<start_date>{DATE})\s+(bis|bis zum)\s+(?P<end_date>{DATE})\b'
             ],
             'create_plan': [
                 r'\b(reiseplan|plan|planung)\s+(erstellen|machen)\b'
@@ -35,39 +40,58 @@ class RasaHandler:
                 r'\b(alles zurücksetzen|zurücksetzen|neu starten|neue reise)\b'
             ]
         }
+        self.entity_only_patterns = [
+            ('get_weather', rf'\b(regnet|sonnig|kalt|warm)\s+(in|für)\s+(?P<weather_location>{LOCATION}){LOCATION_SUFFIX}\b')
+        ]
+        self._compile_matcher()
+
+    def _compile_matcher(self):
+        self.alternatives = []
+        patterns = [(intent, pattern, True) for intent, intent_patterns in self.intent_patterns.items() for pattern in intent_patterns]
+        patterns += [(intent, pattern, False) for intent, pattern in self.entity_only_patterns]
+
+        for intent, pattern, sets_intent in patterns:
+            matcher = re.compile(pattern)
+            self.alternatives.append({
+                'intent': intent,
+                'sets_intent': sets_intent,
+                'matcher': matcher,
+                'multi_group': matcher.groups > 1,
+                'entities': list(matcher.groupindex)
+            })
 
     def process_message(self, message: str, user_id: str) -> Dict[str, Any]:
         try:
             message_lower = message.lower().strip()
-            
+
             best_intent = 'unknown'
             best_confidence = 0.0
-            
-            for intent, patterns in self.intent_patterns.items():
-                for pattern in patterns:
-                    matches = re.findall(pattern, message_lower)
-                    if matches:
-                        if isinstance(matches[0], tuple):
-                            confidence = 0.5
-                        else:
-                            confidence = len(matches[0]) / len(message_lower) if isinstance(matches[0], str) else 0.5
-                        
-                        if confidence > best_confidence:
-                            best_confidence = confidence
-                            best_intent = intent
-            
+            matches = [(alternative, alternative['matcher'].search(message_lower)) for alternative in self.alternatives]
+            for alternative, match in matches:
+                if match is None or not alternative['sets_intent']:
+                    continue
+
+                confidence = 0.5 if alternative['multi_group'] else (match.end() - match.start()) / len(message_lower)
+                if confidence > best_confidence:
+                    best_confidence = confidence
+                    best_intent = alternative['intent']
+
             if best_confidence < 0.1:
                 best_intent = 'unknown'
                 best_confidence = 0.0
-            
+
             logger.info(f"Intent erkannt: {best_intent} (Confidence: {best_confidence:.2f})")
-            
+
             return {
                 'intent': best_intent,
                 'confidence': best_confidence,
-                'entities': self._extract_entities(message_lower, best_intent)
+                'entities': self._extract_entities(
+                    next(((alternative, match) for alternative, match in matches
+                          if match is not None and alternative['intent'] == best_intent), None),
+                    best_intent
+                )
             }
-            
+
         except Exception as e:
             logger.error(f"Fehler bei der Intent-Erkennung: {e}")
             return {
@@ -75,59 +99,28 @@ class RasaHandler:
                 'confidence': 0.0,
                 'entities': {}
             }
-    
-    def _extract_entities(self, message: str, intent: str) -> Dict[str, Any]:
+
+    def _extract_entities(self, entity_match, intent: str) -> Dict[str, Any]:
         entities = {}
-        
-        if intent == 'get_weather':
-            weather_patterns = [
-                r'\b(wetter|wettervorhersage|temperatur)\s+(in|für|von)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)(?:\s+(?:abfragen|suchen|finden|checken|prüfen))?\b',
-                r'\b(wie ist das wetter)\s+(in|für|von)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)(?:\s+(?:abfragen|suchen|finden|checken|prüfen))?\b',
-                r'\b(wetter|temperatur)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)(?:\s+(?:abfragen|suchen|finden|checken|prüfen))?\b',
-                r'\b(regnet|sonnig|kalt|warm)\s+(in|für)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)(?:\s+(?:abfragen|suchen|finden|checken|prüfen))?\b'
-            ]
-            for pattern in weather_patterns:
-                matches = re.findall(pattern, message)
-                if matches:
-                    if len(matches[0]) == 3:
-                        location = matches[0][2].strip()
-                    elif len(matches[0]) == 2:
-                        location = matches[0][1].strip()
-                    else:
-                        continue
-                    
-                    location = re.sub(r'\s+(?:abfragen|suchen|finden|checken|prüfen)$', '', location, flags=re.IGNORECASE)
-                    entities['weather_location'] = location.strip()
-                    break
-        
-        elif intent == 'provide_dates':
-            date_patterns = [
-                r'\b(vom|ab)\s+(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\s+(bis|bis zum)\s+(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\b',
-                r'\b(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\s+(bis|bis zum)\s+(\d{1,2}\.\d{1,2}\.\d{4}|\d{1,2}\.\d{1,2})\b'
-            ]
-            for pattern in date_patterns:
-                matches = re.findall(pattern, message)
-                if matches:
-                    entities['start_date'] = matches[0][1] if len(matches[0]) == 4 else matches[0][0]
-                    entities['end_date'] = matches[0][3] if len(matches[0]) == 4 else matches[0][2]
-                    break
-        
-        elif intent == 'search_hotels':
-            hotel_patterns = [
-                r'\b(hotels|hotel)\s+(in|in)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)\s+(finden|suchen)\b',
-                r'\b(hotel|hotels|unterkunft)\s+(suchen|finden|buchen)\b',
-                r'\b(nach)\s+([a-zA-Zäöüß]+(?:\s+[a-zA-Zäöüß]+)*?)\s+(hotel|hotels|unterkunft)\s+(suchen|finden)\b'
-            ]
-            for pattern in hotel_patterns:
-                matches = re.findall(pattern, message)
-                if matches:
-                    if len(matches[0]) == 4:
-                        if matches[0][0] == 'nach':
-                            entities['hotel_location'] = matches[0][1].strip()
-                        else:
-                            entities['hotel_location'] = matches[0][2].strip()
-                    elif len(matches[0]) == 2:
-                        pass
-                    break
-        
-        return entities 
\ No newline at end of file
+        if entity_match is None:
+            return entities
+
+        alternative, match = entity_match
+        for entity_name in alternative['entities']:
+            value = match.group(entity_name)
+            if value:
+                entities[entity_name] = value.strip()
+
+        if 'weather_location' in entities:
+            entities['weather_location'] = re.sub(
+                r'\s+(?:abfragen|suchen|finden|checken|prüfen)$', '', entities['weather_location'], flags=re.IGNORECASE
+            ).strip()
+
+        if intent == 'provide_dates':
+            start_date, end_date = normalize_trip_window(entities.pop('start_date', None), entities.pop('end_date', None))
+            if start_date:
+                entities['start_date'] = start_date
+            if end_date:
+                entities['end_date'] = end_date
+
+        return entities
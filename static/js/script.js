@@ -24,7 +24,8 @@ function sendMessage() {
         },
         body: JSON.stringify({
             message: message,
-            user_id: userId
+            user_id: userId,
+            compact: true
         })
     })
     .then(response => response.json())
@@ -34,6 +35,9 @@ function sendMessage() {
         if (data.success) {
             const response = data.response;
             addBotMessage(response.message, response.suggestions, response.type);
+            if (response.type === 'hotel_search_pending' && response.job_id) {
+                pollHotelJob(response.job_id, 0);
+            }
         } else {
             addBotMessage('Entschuldigung, es ist ein Fehler aufgetreten.', [], 'error');
         }
@@ -45,6 +49,31 @@ function sendMessage() {
     });
 }
 
+function pollHotelJob(jobId, attempt) {
+    if (attempt >= 90) {
+        addBotMessage('Die Hotelsuche dauert leider zu lange. Bitte versuchen Sie es später erneut.', [], 'error');
+        return;
+    }
+    
+    setTimeout(() => {
+        fetch(`/api/hotels/jobs/${jobId}?compact=1`)
+        .then(response => response.json())
+        .then(data => {
+            if (!data.success || data.status === 'failed') {
+                addBotMessage('Entschuldigung, bei der Hotelsuche ist ein Fehler aufgetreten.', [], 'error');
+            } else if (data.status === 'done' && data.response) {
+                addBotMessage(data.response.message, data.response.suggestions, data.response.type);
+            } else {
+                pollHotelJob(jobId, attempt + 1);
+            }
+        })
+        .catch(error => {
+            console.error('Error:', error);
+            pollHotelJob(jobId, attempt + 1);
+        });
+    }, 2000);
+}
+
 function addMessage(message, sender) {
     const chatMessages = document.getElementById('chatMessages');
     const messageDiv = document.createElement('div');